@@ -11,37 +11,28 @@ async def main():
     print("Jira Assistant - Example Usage")
     print("=" * 60)
     
-    # Example 1: Search for tickets
-    print("\n1. Searching for tickets about login issues...")
-    result = await run_jira_assistant("Find tickets about login issues")
-    print(f"\nResponse: {result['response']}")
-    print(f"Intent: {result['intent']}")
-    print(f"Similar tickets found: {len(result['similar_tickets'])}")
+    # The examples are independent, so run them concurrently; each gets its
+    # own conversation_id so their memory threads don't interleave
+    examples = [
+        ("1. Searching for tickets about login issues...", "Find tickets about login issues"),
+        ("2. Creating a new ticket...", "Create a bug ticket: Users unable to reset password, getting 500 error"),
+        ("3. Asking general question...", "How can you help me?"),
+        ("4. Updating a ticket...", "Update ticket PROJ-123 priority to High"),
+    ]
+    results = await asyncio.gather(*[
+        run_jira_assistant(query, conversation_id=f"example-{i}")
+        for i, (_, query) in enumerate(examples, 1)
+    ])
     
-    # Example 2: Create a new ticket
-    print("\n" + "=" * 60)
-    print("\n2. Creating a new ticket...")
-    result = await run_jira_assistant(
-        "Create a bug ticket: Users unable to reset password, getting 500 error"
-    )
-    print(f"\nResponse: {result['response']}")
-    print(f"Intent: {result['intent']}")
-    if result['created_ticket']:
-        print(f"Created ticket: {result['created_ticket']['key']}")
-    
-    # Example 3: General question
-    print("\n" + "=" * 60)
-    print("\n3. Asking general question...")
-    result = await run_jira_assistant("How can you help me?")
-    print(f"\nResponse: {result['response']}")
-    print(f"Intent: {result['intent']}")
-    
-    # Example 4: Update ticket (if you have a ticket key)
-    print("\n" + "=" * 60)
-    print("\n4. Updating a ticket...")
-    result = await run_jira_assistant("Update ticket PROJ-123 priority to High")
-    print(f"\nResponse: {result['response']}")
-    print(f"Intent: {result['intent']}")
+    for (title, _), result in zip(examples, results):
+        print("\n" + "=" * 60)
+        print(f"\n{title}")
+        print(f"\nResponse: {result['response']}")
+        print(f"Intent: {result.get('intent')}")
+        if result.get('similar_tickets'):
+            print(f"Similar tickets found: {len(result['similar_tickets'])}")
+        if result.get('created_ticket'):
+            print(f"Created ticket: {result['created_ticket']['key']}")
     
     print("\n" + "=" * 60)
     print("Examples completed!")
@@ -1,19 +1,115 @@
 #!/usr/bin/env python3
 """Inspect Vector Database Contents"""
 
+import mmap
 import pickle
+from collections import Counter
 import faiss
+import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from pathlib import Path
 from pprint import pprint
-import json
+
+
+VECTOR_STORE_PATH = Path("./data/vector_store")
+METADATA_PICKLE_PATH = VECTOR_STORE_PATH / "jira_tickets_metadata.pkl"
+METADATA_PARQUET_PATH = VECTOR_STORE_PATH / "jira_tickets_metadata.parquet"
+VECTORS_PATH = VECTOR_STORE_PATH / "jira_tickets_vectors.npy"
+
+
+def load_metadata_table(columns: list = None) -> pa.Table:
+    """Load ticket metadata as an Arrow table, reading only the requested columns.
+    
+    Prefers the columnar Parquet file written at sync time and falls back to
+    the legacy pickle file for vector stores built before it existed.
+    """
+    if METADATA_PARQUET_PATH.exists():
+        return pq.read_table(METADATA_PARQUET_PATH, columns=columns)
+    
+    table = pa.Table.from_pylist(load_full_metadata())
+    if columns:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table
+
+
+def load_full_metadata() -> list:
+    """Load the complete ticket records (all fields) from the pickle file"""
+    with open(METADATA_PICKLE_PATH, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return pickle.loads(mm)
+
+
+def category_counts(columns: list) -> tuple:
+    """Count tickets per value of each categorical column.
+    
+    Returns (total_tickets, {column: [(value, count), ...] most frequent first}).
+    Parquet stores are counted with Arrow kernels; legacy pickle stores are
+    counted in a single pass with one Counter per column.
+    """
+    if METADATA_PARQUET_PATH.exists():
+        table = pq.read_table(METADATA_PARQUET_PATH, columns=columns)
+        counts = {}
+        for column in columns:
+            values = pc.fill_null(table.column(column).cast(pa.string()), "Unknown")
+            value_counts = pc.value_counts(values)
+            counts[column] = Counter(dict(zip(
+                value_counts.field("values").to_pylist(),
+                value_counts.field("counts").to_pylist()
+            ))).most_common()
+        return table.num_rows, counts
+    
+    metadata = load_full_metadata()
+    counters = {column: Counter() for column in columns}
+    for ticket in metadata:
+        for column, counter in counters.items():
+            counter[ticket.get(column, 'Unknown')] += 1
+    return len(metadata), {column: counter.most_common() for column, counter in counters.items()}
+
+
+def measure_recall(index, k: int = 10, n_queries: int = 100):
+    """Estimate recall@k of an approximate index against exact L2 search.
+    
+    Uses a sample of the stored vectors as queries, so no extra data is needed.
+    Returns None when the fp32 vectors are not available.
+    """
+    if VECTORS_PATH.exists():
+        vectors = np.load(VECTORS_PATH, mmap_mode='r')
+    elif isinstance(index, faiss.IndexHNSWFlat):
+        vectors = index.reconstruct_n(0, index.ntotal)
+    else:
+        return None
+    
+    n = len(vectors)
+    k = min(k, n)
+    if k == 0:
+        return None
+    
+    rng = np.random.default_rng(0)
+    sample = rng.choice(n, size=min(n_queries, n), replace=False)
+    queries = np.asarray(vectors[np.sort(sample)], dtype=np.float32)
+    
+    exact = faiss.IndexFlatL2(index.d)
+    exact.add(np.asarray(vectors, dtype=np.float32))
+    _, truth = exact.search(queries, k)
+    _, approx = index.search(queries, k)
+    
+    hits = sum(len(set(t) & set(a)) for t, a in zip(truth, approx))
+    return hits / (len(queries) * k)
+
 
 def inspect_vector_store():
     """Inspect and display vector store contents"""
     
-    # Paths
-    vector_store_path = Path("./data/vector_store")
-    index_path = vector_store_path / "jira_tickets.index"
-    metadata_path = vector_store_path / "jira_tickets_metadata.pkl"
+    # Paths (quantized stores use their own index file, see FAISS_INDEX_TYPE)
+    index_path = VECTOR_STORE_PATH / "jira_tickets.index"
+    for candidate in ("jira_tickets.hnsw.index", "jira_tickets.hnsw_sq8.index",
+                      "jira_tickets.ivfpq.index", "jira_tickets.fp16.index",
+                      "jira_tickets.sq8.index", "jira_tickets.bin.index"):
+        if not index_path.exists() and (VECTOR_STORE_PATH / candidate).exists():
+            index_path = VECTOR_STORE_PATH / candidate
+    is_binary = index_path.name.endswith(".bin.index")
     
     print("=" * 80)
     print("🔍 JIRA VECTOR DATABASE INSPECTOR")
@@ -28,17 +124,35 @@ def inspect_vector_store():
         print("   python main.py")
         return
     
-    if not metadata_path.exists():
+    if not METADATA_PARQUET_PATH.exists() and not METADATA_PICKLE_PATH.exists():
         print("❌ Metadata file not found!")
-        print(f"   Expected: {metadata_path}")
+        print(f"   Expected: {METADATA_PARQUET_PATH}")
         return
     
     # Load FAISS index
     print("📊 FAISS Index Information:")
     print("-" * 80)
     try:
-        index = faiss.read_index(str(index_path))
+        index = faiss.read_index_binary(str(index_path)) if is_binary else faiss.read_index(str(index_path))
         print(f"✅ Index Type: {type(index).__name__}")
+        if is_binary:
+            print("✅ Quantization: 1 bit/dim (Hamming search, fp32 rerank)")
+        elif isinstance(index, faiss.IndexIVFPQ):
+            print(f"✅ IVF Lists (nlist): {index.nlist}")
+            print(f"✅ Probes (nprobe): {index.nprobe}")
+            print(f"✅ PQ Sub-quantizers (M): {index.pq.M}")
+            print(f"✅ PQ Bits per Code: {index.pq.nbits}")
+        elif isinstance(index, faiss.IndexScalarQuantizer):
+            qtypes = {faiss.ScalarQuantizer.QT_fp16: "fp16", faiss.ScalarQuantizer.QT_8bit: "int8"}
+            print(f"✅ Quantizer: {qtypes.get(index.sq.qtype, index.sq.qtype)} ({index.sq.code_size} bytes/vector)")
+        elif isinstance(index, faiss.IndexHNSW):
+            print(f"✅ HNSW Neighbors (M): {index.hnsw.nb_neighbors(1)}")
+            print(f"✅ efConstruction: {index.hnsw.efConstruction}")
+            print(f"✅ efSearch: {index.hnsw.efSearch}")
+        if isinstance(index, (faiss.IndexIVF, faiss.IndexHNSW, faiss.IndexScalarQuantizer)):
+            recall = measure_recall(index)
+            if recall is not None:
+                print(f"✅ Recall@10 vs exact search: {recall:.3f}")
         print(f"✅ Total Vectors: {index.ntotal}")
         print(f"✅ Vector Dimension: {index.d}")
         print(f"✅ Is Trained: {index.is_trained}")
@@ -51,13 +165,13 @@ def inspect_vector_store():
     print("📋 Ticket Metadata:")
     print("-" * 80)
     try:
-        with open(metadata_path, 'rb') as f:
-            metadata = pickle.load(f)
+        # Histograms only need the categorical columns
+        total, counts = category_counts(['status', 'priority', 'issue_type'])
         
-        print(f"✅ Total Tickets: {len(metadata)}")
+        print(f"✅ Total Tickets: {total}")
         print()
         
-        if not metadata:
+        if total == 0:
             print("⚠️  No tickets in database yet!")
             return
         
@@ -65,30 +179,16 @@ def inspect_vector_store():
         print("📈 Summary Statistics:")
         print("-" * 80)
         
-        # Count by status
-        status_counts = {}
-        priority_counts = {}
-        type_counts = {}
-        
-        for ticket in metadata:
-            status = ticket.get('status', 'Unknown')
-            priority = ticket.get('priority', 'Unknown')
-            issue_type = ticket.get('issue_type', 'Unknown')
-            
-            status_counts[status] = status_counts.get(status, 0) + 1
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-            type_counts[issue_type] = type_counts.get(issue_type, 0) + 1
-        
-        print(f"📊 By Status:")
-        for status, count in sorted(status_counts.items(), key=lambda x: x[1], reverse=True):
+        print("📊 By Status:")
+        for status, count in counts['status']:
             print(f"   {status}: {count}")
         
-        print(f"\n🎯 By Priority:")
-        for priority, count in sorted(priority_counts.items(), key=lambda x: x[1], reverse=True):
+        print("\n🎯 By Priority:")
+        for priority, count in counts['priority']:
             print(f"   {priority}: {count}")
         
-        print(f"\n🏷️  By Type:")
-        for itype, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
+        print("\n🏷️  By Type:")
+        for itype, count in counts['issue_type']:
             print(f"   {itype}: {count}")
         
         print()
@@ -97,7 +197,9 @@ def inspect_vector_store():
         print("📝 Sample Tickets (First 5):")
         print("=" * 80)
         
-        for i, ticket in enumerate(metadata[:5], 1):
+        table = load_metadata_table()
+        
+        for i, ticket in enumerate(table.slice(0, 5).to_pylist(), 1):
             print(f"\n{i}. {ticket['key']} - {ticket['status']}")
             print(f"   Summary: {ticket['summary']}")
             print(f"   Priority: {ticket['priority']} | Type: {ticket['issue_type']}")
@@ -117,8 +219,8 @@ def inspect_vector_store():
         
         if export_choice == 'y':
             export_path = "vector_db_export.json"
-            with open(export_path, 'w') as f:
-                json.dump(metadata, f, indent=2, default=str)
+            with open(export_path, 'wb') as f:
+                f.write(orjson.dumps(load_full_metadata(), option=orjson.OPT_INDENT_2, default=str))
             print(f"✅ Exported to: {export_path}")
         
         # Search simulation
@@ -128,7 +230,7 @@ def inspect_vector_store():
         if search_choice == 'y':
             query = input("Enter search query: ").strip()
             if query:
-                simulate_search(query, metadata)
+                simulate_search(query, table)
         
     except Exception as e:
         print(f"❌ Error reading metadata: {e}")
@@ -136,24 +238,31 @@ def inspect_vector_store():
         traceback.print_exc()
 
 
-def simulate_search(query: str, metadata: list):
+def simulate_search(query: str, table: pa.Table):
     """Simulate a search (keyword-based for demo)"""
     print("\n🔍 Search Results (keyword-based demo):")
     print("-" * 80)
     
-    query_lower = query.lower()
-    results = []
-    
-    for ticket in metadata:
-        summary = ticket.get('summary', '').lower()
-        description = ticket.get('description', '').lower()
-        
-        if query_lower in summary or query_lower in description:
-            results.append(ticket)
+    # Case-insensitive substring scan over whole columns in one vectorized pass.
+    # Stores synced with lowercased columns are matched directly; legacy ones fold case per query.
+    if 'summary_lc' in table.column_names and 'description_lc' in table.column_names:
+        query_lc = query.lower()
+        mask = pc.or_(
+            pc.match_substring(table.column('summary_lc'), query_lc),
+            pc.match_substring(table.column('description_lc'), query_lc)
+        )
+    else:
+        summary = pc.fill_null(table.column('summary'), '')
+        description = pc.fill_null(table.column('description'), '')
+        mask = pc.or_(
+            pc.match_substring(summary, query, ignore_case=True),
+            pc.match_substring(description, query, ignore_case=True)
+        )
+    matches = table.filter(mask)
     
-    if results:
-        print(f"Found {len(results)} matching ticket(s):\n")
-        for i, ticket in enumerate(results[:10], 1):
+    if matches.num_rows:
+        print(f"Found {matches.num_rows} matching ticket(s):\n")
+        for i, ticket in enumerate(matches.slice(0, 10).to_pylist(), 1):
             print(f"{i}. {ticket['key']}: {ticket['summary']}")
             print(f"   Status: {ticket['status']} | Priority: {ticket['priority']}")
             print()
@@ -163,14 +272,11 @@ def simulate_search(query: str, metadata: list):
 
 def show_detailed_ticket():
     """Show detailed view of a specific ticket"""
-    metadata_path = Path("./data/vector_store/jira_tickets_metadata.pkl")
-    
-    if not metadata_path.exists():
+    if not METADATA_PICKLE_PATH.exists():
         print("❌ Metadata file not found!")
         return
     
-    with open(metadata_path, 'rb') as f:
-        metadata = pickle.load(f)
+    metadata = load_full_metadata()
     
     ticket_key = input("\nEnter ticket key (e.g., SCRUM-123): ").strip().upper()
     
@@ -0,0 +1 @@
+"""Jira agent package - executes Jira ticket create/update actions"""
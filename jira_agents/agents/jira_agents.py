@@ -3,15 +3,11 @@
 # it only executes create or update based on action field
 # action is provided by orchestrator agent
 
+from functools import lru_cache
 from typing import Dict, Any, Literal, TypedDict
-from pydantic import BaseModel, Field
-import sys
-import os
+from pydantic import BaseModel, Field, TypeAdapter
 
-# Add parent directory to path to import services
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from services.jira_services import (
+from jira_agents.services.jira_services import (
     create_jira_ticket,
     update_jira_ticket_with_comment,
     get_jira_service
@@ -29,6 +25,7 @@ class JiraAgentState(TypedDict, total=False):
         projectKey: Jira project key (e.g., 'PROJ')
         issueType: Issue type (e.g., 'Task', 'Bug', 'Story')
         issueKey: Existing issue key for updates (e.g., 'PROJ-123')
+        initialComment: Comment to add when creating a ticket (sent with the create request)
     """
     action: str
     summary: str
@@ -36,6 +33,7 @@ class JiraAgentState(TypedDict, total=False):
     projectKey: str
     issueType: str
     issueKey: str
+    initialComment: str
 
 
 async def execute_create_ticket_action(state: JiraAgentState) -> str:
@@ -64,7 +62,8 @@ async def execute_create_ticket_action(state: JiraAgentState) -> str:
         project_key=state["projectKey"],
         summary=state["summary"],
         description=state["description"],
-        issue_type=state.get("issueType", "Task")
+        issue_type=state.get("issueType", "Task"),
+        initial_comment=state.get("initialComment")
     )
     
     return issue_key
@@ -127,6 +126,14 @@ class JiraAction(BaseModel):
         default=None,
         description="Comment text (required for add_comment)"
     )
+    initial_comment: str | None = Field(
+        default=None,
+        description="Comment added together with the new ticket (optional, for create_ticket)"
+    )
+
+
+# Built once at import so per-request validation reuses the compiled validator
+_ACTION_ADAPTER = TypeAdapter(JiraAction)
 
 
 class JiraAgent:
@@ -186,7 +193,8 @@ class JiraAgent:
             project_key=action.project_key,
             summary=action.summary,
             description=action.description,
-            issue_type=action.issue_type or "Task"
+            issue_type=action.issue_type or "Task",
+            initial_comment=action.initial_comment
         )
         
         return {
@@ -225,23 +233,29 @@ class JiraAgent:
             "message": f"Successfully added comment to {action.issue_key}"
         }
     
-    async def execute_from_dict(self, action_dict: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_from_dict(self, action_dict: Dict[str, Any], validate: bool = True) -> Dict[str, Any]:
         """
         Execute a Jira action from a dictionary (convenience method)
         
         Args:
             action_dict: Dictionary containing action and parameters
+            validate: Set to False when the caller has already validated the dict
+                      (skips Pydantic validation via model_construct)
         
         Returns:
             Dict containing the result of the action
         """
-        action = JiraAction(**action_dict)
+        if validate:
+            action = _ACTION_ADAPTER.validate_python(action_dict)
+        else:
+            action = JiraAction.model_construct(**action_dict)
         return await self.execute_action(action)
 
 
 # Convenience function to get a JiraAgent instance
+@lru_cache(maxsize=1)
 def get_jira_agent() -> JiraAgent:
-    """Get an instance of JiraAgent"""
+    """Get the shared JiraAgent instance (created on first use)"""
     return JiraAgent()
 
 
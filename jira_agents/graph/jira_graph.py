@@ -1,20 +1,19 @@
 # create a langgraph stategraph for jira agent
 # this graph should route to create or update node based on action
 
+import os
+import logging
 from typing import Literal
 from langgraph.graph import StateGraph, END
-import sys
-import os
-
-# Add parent directory to path to import agents
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agents.jira_agents import (
+from jira_agents.agents.jira_agents import (
     JiraAgentState,
     execute_create_ticket_action,
     execute_update_ticket_action
 )
 
+logger = logging.getLogger(__name__)
+
 
 # Node functions
 async def create_ticket_node(state: JiraAgentState) -> JiraAgentState:
@@ -27,13 +26,13 @@ async def create_ticket_node(state: JiraAgentState) -> JiraAgentState:
     Returns:
         Updated state with created issue key
     """
-    print(f"Creating ticket: {state.get('summary')}")
+    logger.debug("Creating ticket: %s", state.get("summary"))
     
     issue_key = await execute_create_ticket_action(state)
     
     # Update state with the created issue key
     state["issueKey"] = issue_key
-    print(f"✓ Created ticket: {issue_key}")
+    logger.info("Created ticket: %s", issue_key)
     
     return state
 
@@ -48,12 +47,12 @@ async def update_ticket_node(state: JiraAgentState) -> JiraAgentState:
     Returns:
         Updated state after adding comment
     """
-    print(f"Updating ticket: {state.get('issueKey')}")
+    logger.debug("Updating ticket: %s", state.get("issueKey"))
     
     success = await execute_update_ticket_action(state)
     
     if success:
-        print(f"✓ Updated ticket: {state.get('issueKey')}")
+        logger.info("Updated ticket: %s", state.get("issueKey"))
     
     return state
 
@@ -80,6 +79,7 @@ def create_jira_graph() -> StateGraph:
     The graph routes to create or update node based on action field:
     - START -> router -> create_ticket -> END
     - START -> router -> update_ticket -> END
+    - START -> router -> END (action "noop", used by server warmup)
     
     Returns:
         Compiled StateGraph
@@ -96,7 +96,8 @@ def create_jira_graph() -> StateGraph:
         route_action,
         {
             "create_ticket": "create_ticket",
-            "update_ticket": "update_ticket"
+            "update_ticket": "update_ticket",
+            "noop": END  # server warmup; same as JiraAgentDispatcher
         }
     )
     
@@ -108,8 +109,37 @@ def create_jira_graph() -> StateGraph:
     return workflow.compile()
 
 
-# Compile Jira agent graph and expose as jira_agent variable
-jira_agent = create_jira_graph()
+class JiraAgentDispatcher:
+    """
+    Direct dispatcher with the same ainvoke() interface as the compiled graph
+    
+    The graph only routes on the action field to one node and ends, so calling
+    the node directly gives the same result without LangGraph's per-invocation
+    state handling and edge evaluation.
+    
+    A create_ticket state carrying initialComment is handled entirely by the
+    create node: the comment is sent with the create request, so no separate
+    update_ticket call is needed.
+    """
+    
+    async def ainvoke(self, state: JiraAgentState) -> JiraAgentState:
+        action = route_action(state)
+        if action == "create_ticket":
+            return await create_ticket_node(state)
+        if action == "update_ticket":
+            return await update_ticket_node(state)
+        if action == "noop":
+            # Used by server warmup to exercise the dispatch path without calling Jira
+            return state
+        raise ValueError(f"Unknown action: {action}")
+
+
+# Expose the Jira agent as jira_agent; set USE_LANGGRAPH=1 to run the
+# compiled StateGraph instead of the direct dispatcher (e.g. for parity checks)
+if os.getenv("USE_LANGGRAPH") == "1":
+    jira_agent = create_jira_graph()
+else:
+    jira_agent = JiraAgentDispatcher()
 
 
 # Legacy alias for backward compatibility
@@ -1,18 +1,27 @@
 """
 Entry point to test Jira Agent
 Invoke jira agent with update and create sample payload
+
+Usage (from the project root):
+    python -m jira_agents.main
 """
 
+import os
 import asyncio
+import logging
+from typing import List, Union
 from dotenv import load_dotenv
-from graph.jira_graph import jira_agent
+from jira_agents.graph.jira_graph import jira_agent
 
-from agents.jira_agents import JiraAgentState
-from sample_payload import sample_payload
+from jira_agents.agents.jira_agents import JiraAgentState
+from jira_agents.services import jira_services
+from jira_agents.sample_payload import sample_payload
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 async def test_create_ticket():
     """Test creating a Jira ticket"""
@@ -99,41 +108,48 @@ async def main():
     # Example test: call with unified sample payload
     print("\n--- Testing with sample_payload ---")
     await main_with_payload(sample_payload)
+    
+    # Flush queued notifications before the event loop exits
+    await jira_services.aclose()
 
 # New entry point for orchestrator agent
-async def main_with_payload(payload: JiraAgentState):
-    """Entry point for orchestrator agent to call Jira agent with payload"""
+async def main_with_payload(payload: Union[JiraAgentState, List[JiraAgentState]]):
+    """Entry point for orchestrator agent to call Jira agent with payload
+
+    A list of payloads is dispatched concurrently (each call is an independent
+    Jira round-trip), so a batch takes roughly as long as its slowest item.
+    """
+    if isinstance(payload, list):
+        return await asyncio.gather(*[main_with_payload(p) for p in payload])
+
     # Decide action based on presence of 'issueKey'
     if payload.get("action") == "update_ticket" or "issueKey" in payload:
-        await test_update_ticket_with_payload(payload)
+        return await test_update_ticket_with_payload(payload)
     else:
-        await test_create_ticket_with_payload(payload)
+        return await test_create_ticket_with_payload(payload)
 
 # Helper functions to use the orchestrator's payload
 async def test_create_ticket_with_payload(payload: JiraAgentState):
-    print("\n📝 Creating ticket (from orchestrator payload)...")
+    logger.debug("Creating ticket (from orchestrator payload)")
     try:
         result = await jira_agent.ainvoke(payload)
-        print(f"\n✅ SUCCESS! Created Issue: {result.get('issueKey')}")
+        logger.info("Created issue: %s", result.get('issueKey'))
         return result.get('issueKey')
     except Exception as e:
-        print(f"\n❌ Error: {e}")
+        logger.error("Create failed: %s", e)
         return None
 
 async def test_update_ticket_with_payload(payload: JiraAgentState):
-    print("\n💬 Updating ticket (from orchestrator payload)...")
+    logger.debug("Updating ticket (from orchestrator payload)")
     try:
         result = await jira_agent.ainvoke(payload)
-        print(f"\n✅ SUCCESS! Updated Issue: {result.get('issueKey')}")
+        logger.info("Updated issue: %s", result.get('issueKey'))
         return True
     except Exception as e:
-        print(f"\n❌ Error: {e}")
-    
-    print("\n" + "="*60)
-    print("TEST SUITE COMPLETED")
-    print("="*60 + "\n")
+        logger.error("Update failed: %s", e)
     return False
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     asyncio.run(main())
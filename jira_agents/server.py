@@ -0,0 +1,143 @@
+"""FastAPI server for the Jira Agent
+
+Usage (from the project root):
+    uvicorn jira_agents.server:app --loop uvloop --http httptools
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Union
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# Import the compiled Jira agent graph
+from jira_agents.graph.jira_graph import jira_agent
+from jira_agents.services import jira_services
+from jira_agents.services.jira_services import get_jira_service
+
+# Import sample payload
+try:
+    from jira_agents.sample_payload import sample_payload
+except Exception:
+    sample_payload = {}
+
+# orjson serializes the (possibly large) result_state payloads much faster than the stdlib encoder
+app = FastAPI(title="Jira Agent API", default_response_class=ORJSONResponse)
+
+# Configure logging once for the agent nodes and services
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
+# Maximum number of Jira agent invocations in flight for a batch request
+JIRA_CONCURRENCY = int(os.getenv("JIRA_CONCURRENCY", "8"))
+
+
+class PayloadModel(BaseModel):
+    payload: Dict[str, Any]
+
+
+def prepare_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the action and check required fields, raising HTTPException on bad input."""
+    # Ensure payload is a dict
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Payload must be a JSON object")
+
+    # Decide action on behalf of orchestrator if missing
+    if not payload.get("action"):
+        if payload.get("issueKey"):
+            payload["action"] = "update_ticket"
+        else:
+            payload["action"] = "create_ticket"
+
+    # Minimal validation
+    if payload["action"] == "create_ticket":
+        if not payload.get("projectKey") or not payload.get("summary"):
+            raise HTTPException(status_code=400, detail="Missing required fields for create_ticket: projectKey and summary")
+    elif payload["action"] == "update_ticket":
+        if not payload.get("issueKey"):
+            raise HTTPException(status_code=400, detail="Missing required field for update_ticket: issueKey")
+
+    return payload
+
+
+def build_response(payload: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the friendly response for a finished Jira agent invocation."""
+    issue_key = result.get("issueKey") or result.get("issue_key")
+    base_url = os.getenv("JIRA_BASE_URL")
+    issue_url = f"{base_url}/browse/{issue_key}" if base_url and issue_key else None
+
+    return {
+        "success": True,
+        "action": payload["action"],
+        "result_state": result,
+        "issue_key": issue_key,
+        "issue_url": issue_url,
+    }
+
+
+async def call_jira_batch(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Invoke the Jira agent for several payloads concurrently.
+
+    At most JIRA_CONCURRENCY invocations run at once. Each item gets its own
+    result entry, so one failing payload does not fail the whole batch.
+    """
+    sem = asyncio.Semaphore(JIRA_CONCURRENCY)
+
+    async def run_one(payload: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            payload = prepare_payload(payload)
+            async with sem:
+                result = await jira_agent.ainvoke(payload)
+            return build_response(payload, result)
+        except HTTPException as e:
+            return {"success": False, "error": e.detail}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    return await asyncio.gather(*[run_one(p) for p in payloads])
+
+
+@app.on_event("startup")
+async def warmup():
+    """Pay one-time initialization costs before the first request arrives."""
+    try:
+        await jira_agent.ainvoke({"action": "noop"})
+        # Cached singleton: credentials are read once here, not on the first /jira call
+        get_jira_service()
+    except Exception as e:
+        logger.warning(f"Jira agent warmup incomplete: {e}")
+
+
+# Release the pooled Jira and notification connections on shutdown
+app.add_event_handler("shutdown", jira_services.aclose)
+
+
+@app.get("/sample")
+async def get_sample():
+    """Return a sample payload. Uncomment issueKey for update."""
+    return {"sample_payload": sample_payload}
+
+
+@app.post("/jira")
+async def call_jira_agent(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+    """Endpoint to accept a Jira payload and invoke the Jira agent graph.
+
+    The endpoint will set 'action' based on the presence of 'issueKey' if not provided.
+    Returns the final state (including issueKey on create) and a friendly response.
+    A JSON array of payloads is processed concurrently and returns one result per item.
+    """
+    if isinstance(payload, list):
+        return {"results": await call_jira_batch(payload)}
+
+    payload = prepare_payload(payload)
+
+    # Invoke the Jira agent graph
+    try:
+        result = await jira_agent.ainvoke(payload)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return build_response(payload, result)
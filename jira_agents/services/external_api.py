@@ -0,0 +1,315 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Read default endpoint and headers from environment
+DEFAULT_NOTIFICATION_ENDPOINT = os.getenv("NOTIFICATION_ENDPOINT")
+DEFAULT_NOTIFICATION_API_KEY = os.getenv("NOTIFICATION_API_KEY")
+
+# Default request headers, set once on the shared client; per-call headers override them
+_DEFAULT_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+if DEFAULT_NOTIFICATION_API_KEY:
+    _DEFAULT_HEADERS["Authorization"] = f"Bearer {DEFAULT_NOTIFICATION_API_KEY}"
+
+# When set, the background worker coalesces queued notifications and posts
+# {"events": [...]} here: up to NOTIFY_BATCH_SIZE events, waiting at most
+# NOTIFY_FLUSH_MS for a batch to fill. Unset means one POST per notification.
+NOTIFICATION_BATCH_ENDPOINT = os.getenv("NOTIFICATION_BATCH_ENDPOINT")
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", "16"))
+NOTIFY_FLUSH_MS = float(os.getenv("NOTIFY_FLUSH_MS", "50"))
+
+# Shared client so notification posts (and their retries) reuse pooled connections
+_NOTIFY_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Notifications queued by enqueue_jira_notification and posted by a background worker,
+# so Jira writes return without waiting on the notification endpoint
+NOTIFICATION_QUEUE_SIZE = 1024
+_notification_queue: Optional[asyncio.Queue] = None
+_notification_worker_task: Optional[asyncio.Task] = None
+
+# Retry backoff is capped, and after BREAKER_THRESHOLD consecutive failed notifications
+# the endpoint is skipped for BREAKER_COOLDOWN seconds instead of being retried by every caller
+MAX_BACKOFF = 10.0
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+_breaker = {"failures": 0, "open_until": 0.0}
+
+# Only this much of a notification response body is read; it is just logged/returned
+MAX_RESPONSE_BYTES = 4096
+
+
+def _get_notify_client() -> httpx.AsyncClient:
+    """Get the shared notification client (created on first use)"""
+    global _NOTIFY_CLIENT
+    if _NOTIFY_CLIENT is None or _NOTIFY_CLIENT.is_closed:
+        _NOTIFY_CLIENT = httpx.AsyncClient(
+            headers=_DEFAULT_HEADERS,
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _NOTIFY_CLIENT
+
+
+async def aclose(drain_timeout: float = 5.0) -> None:
+    """Flush queued notifications (up to drain_timeout seconds) and close the shared client"""
+    global _NOTIFY_CLIENT, _notification_queue, _notification_worker_task
+    if _notification_worker_task is not None:
+        try:
+            await asyncio.wait_for(_notification_queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d queued notifications on shutdown", _notification_queue.qsize())
+        _notification_worker_task.cancel()
+        _notification_worker_task = None
+        _notification_queue = None
+    if _NOTIFY_CLIENT is not None:
+        await _NOTIFY_CLIENT.aclose()
+        _NOTIFY_CLIENT = None
+
+
+def _backoff_wait(attempt: int, backoff_factor: float) -> float:
+    """Full-jitter exponential backoff, so concurrent retries do not fire in lockstep."""
+    return random.uniform(0, min(MAX_BACKOFF, backoff_factor * (2 ** (attempt - 1))))
+
+
+def _retry_after(response: httpx.Response, default: float) -> float:
+    """Seconds to wait from a Retry-After header (seconds form), else default."""
+    try:
+        return min(MAX_BACKOFF, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return default
+
+
+async def _read_capped(response: httpx.Response, limit: int = MAX_RESPONSE_BYTES) -> Any:
+    """Read at most limit bytes of a streamed response; parse JSON when it fits, else decode text."""
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    raw = b"".join(chunks)[:limit]
+    if "json" in response.headers.get("Content-Type", ""):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return raw.decode("utf-8", "replace")
+
+
+def _record_failure() -> None:
+    _breaker["failures"] += 1
+    if _breaker["failures"] >= BREAKER_THRESHOLD:
+        _breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+        logger.warning(
+            f"Notification endpoint failed {_breaker['failures']} times in a row; "
+            f"skipping notifications for {BREAKER_COOLDOWN}s"
+        )
+
+
+async def post_notification(
+    payload: Dict[str, Any],
+    endpoint: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    retries: int = 3,
+    timeout: float = 10.0,
+    backoff_factor: float = 0.5,
+) -> Dict[str, Any]:
+    """Post a JSON payload to a configured endpoint with retries and error handling.
+
+    Args:
+        payload: JSON-serializable dict to send
+        endpoint: URL to post to; if None, DEFAULT_NOTIFICATION_ENDPOINT is used
+        headers: Optional headers, merged over the client defaults (JSON Content-Type/Accept and,
+                 if DEFAULT_NOTIFICATION_API_KEY is set, Authorization: Bearer <API_KEY>)
+        retries: Number of retry attempts for transient errors
+        timeout: Request timeout in seconds
+        backoff_factor: Base backoff multiplier for exponential backoff (with full jitter)
+
+    While the circuit breaker is open (after repeated failures), returns immediately
+    with error "circuit_open".
+
+    Returns:
+        Dict with result information: {"success": bool, "status_code": int|None, "response": Any|None, "error": str|None}
+    """
+    endpoint = endpoint or DEFAULT_NOTIFICATION_ENDPOINT
+    if not endpoint:
+        msg = "No notification endpoint configured (NOTIFICATION_ENDPOINT not set). Skipping notification."
+        logger.info(msg)
+        return {"success": False, "status_code": None, "response": None, "error": msg}
+
+    if time.monotonic() < _breaker["open_until"]:
+        return {"success": False, "status_code": None, "response": None, "error": "circuit_open"}
+
+    client = _get_notify_client()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            # Streamed so a huge (e.g. HTML error page) body is never fully downloaded or parsed
+            async with client.stream(
+                "POST", endpoint, content=orjson.dumps(payload), headers=headers, timeout=timeout
+            ) as response:
+                text = await _read_capped(response)
+
+            status = response.status_code
+
+            if 200 <= status < 300:
+                _breaker["failures"] = 0
+                logger.info(f"Notification sent successfully to {endpoint} (status={status})")
+                return {"success": True, "status_code": status, "response": text, "error": None}
+
+            # Retry on server errors or 429 (rate limit)
+            if status >= 500 or status == 429:
+                if attempt <= retries:
+                    wait = _backoff_wait(attempt, backoff_factor)
+                    if status in (429, 503):
+                        wait = _retry_after(response, wait)
+                    logger.warning(
+                        f"Transient error posting notification (status {status}). Retrying in {wait:.2f}s... (attempt {attempt}/{retries})"
+                    )
+                    await asyncio.sleep(wait)
+                    continue
+                else:
+                    err = f"Notification failed after {attempt} attempts with status {status}. Response: {text}"
+                    logger.error(err)
+                    _record_failure()
+                    return {"success": False, "status_code": status, "response": text, "error": err}
+
+            # For client errors (4xx other than 429), do not retry
+            err = f"Notification request failed with status {status}. Response: {text}"
+            logger.error(err)
+            return {"success": False, "status_code": status, "response": text, "error": err}
+
+        except httpx.RequestError as exc:
+            # Network-related errors are retriable
+            if attempt <= retries:
+                wait = _backoff_wait(attempt, backoff_factor)
+                logger.warning(f"Request error sending notification: {exc}. Retrying in {wait:.2f}s...")
+                await asyncio.sleep(wait)
+                continue
+            else:
+                err = f"Request error after {attempt} attempts: {exc}"
+                logger.exception(err)
+                _record_failure()
+                return {"success": False, "status_code": None, "response": None, "error": err}
+        except Exception as exc:
+            logger.exception(f"Unexpected error when posting notification: {exc}")
+            return {"success": False, "status_code": None, "response": None, "error": str(exc)}
+
+
+def build_jira_notification(
+    action: str,
+    issue_key: str,
+    issue_url: str,
+    summary: Optional[str] = None,
+    description: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build the Jira notification payload: action, issue_key, issue_url, summary, description and extra."""
+    payload = {
+        "action": action,
+        "issue_key": issue_key,
+        "issue_url": issue_url,
+        "summary": summary,
+        "description": description,
+    }
+    if extra:
+        payload["extra"] = extra
+    return payload
+
+
+async def send_jira_notification(
+    action: str,
+    issue_key: str,
+    issue_url: str,
+    summary: Optional[str] = None,
+    description: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+    endpoint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Convenience wrapper to send a Jira-related notification payload and wait for the result.
+
+    Payload includes action, issue_key, issue_url, summary, description and any extra fields.
+    """
+    payload = build_jira_notification(action, issue_key, issue_url, summary, description, extra)
+    return await post_notification(payload, endpoint=endpoint)
+
+
+async def _next_batch(queue: asyncio.Queue) -> List[Dict[str, Any]]:
+    """Wait for one payload, then collect more until the batch is full or the flush interval ends."""
+    batch = [await queue.get()]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + NOTIFY_FLUSH_MS / 1000
+    while len(batch) < NOTIFY_BATCH_SIZE:
+        try:
+            batch.append(queue.get_nowait())
+            continue
+        except asyncio.QueueEmpty:
+            pass
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), remaining))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+
+async def _notification_worker(queue: asyncio.Queue) -> None:
+    """Post queued notification payloads (batched if configured) until cancelled."""
+    while True:
+        if NOTIFICATION_BATCH_ENDPOINT:
+            batch = await _next_batch(queue)
+        else:
+            batch = [await queue.get()]
+        try:
+            if NOTIFICATION_BATCH_ENDPOINT:
+                await post_notification({"events": batch}, endpoint=NOTIFICATION_BATCH_ENDPOINT)
+            else:
+                await post_notification(batch[0])
+        except Exception as exc:
+            logger.exception(f"Unexpected error in notification worker: {exc}")
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+def _get_notification_queue() -> asyncio.Queue:
+    """Get the notification queue, starting its worker on the running event loop if needed."""
+    global _notification_queue, _notification_worker_task
+    if _notification_worker_task is None or _notification_worker_task.done():
+        _notification_queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        _notification_worker_task = asyncio.create_task(_notification_worker(_notification_queue))
+    return _notification_queue
+
+
+def enqueue_jira_notification(
+    action: str,
+    issue_key: str,
+    issue_url: str,
+    summary: Optional[str] = None,
+    description: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Queue a Jira notification for the background worker and return immediately.
+
+    Must be called from a running event loop. Returns False (and logs) when the
+    queue is full and the notification is dropped.
+    """
+    payload = build_jira_notification(action, issue_key, issue_url, summary, description, extra)
+    try:
+        _get_notification_queue().put_nowait(payload)
+    except asyncio.QueueFull:
+        logger.warning(f"Notification queue full; dropping {action} notification for {issue_key}")
+        return False
+    return True
@@ -0,0 +1,679 @@
+# jira service wrapper
+# this file should contain functions to create and update jira tickets
+# authentication should be done using email and api token from environment variables
+# use jira cloud rest api v3
+
+import os
+import time
+import base64
+import asyncio
+import logging
+import httpx
+import orjson
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
+from dotenv import load_dotenv
+
+from . import external_api
+from .external_api import enqueue_jira_notification
+from src.utils.single_flight import single_flight
+
+# Load environment variables
+load_dotenv()
+
+# Fields requested on issue reads; Jira returns the full issue schema otherwise.
+# Set JIRA_FULL_FIELDS=1 to fetch everything (useful when debugging).
+ISSUE_FIELDS = "summary,status,priority,issuetype,description"
+# Search results are listings, so they skip the (large) description by default
+DEFAULT_SEARCH_FIELDS = "summary,status,priority"
+FULL_FIELDS = os.getenv("JIRA_FULL_FIELDS") == "1"
+
+# Seconds get_ticket/search_tickets responses are served from memory (0 disables)
+CACHE_TTL = float(os.getenv("JIRA_CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = 1024
+# Seconds an issue's ETag and body are kept for If-None-Match revalidation
+ETAG_CACHE_TTL = 3600.0
+
+# Seconds a (project, target status) -> transition id lookup is reused (0 disables)
+TRANSITION_CACHE_TTL = float(os.getenv("JIRA_TRANSITION_CACHE_TTL", "300"))
+
+
+class _TTLCache:
+    """Small in-process cache for Jira GET responses with a fixed time-to-live"""
+    
+    def __init__(self, ttl: float, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: Dict[Tuple, Tuple[float, Any]] = {}
+    
+    def get(self, key: Tuple) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._data[key]
+            return None
+        return entry[1]
+    
+    def set(self, key: Tuple, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._data.pop(key, None)
+        if len(self._data) >= self.max_entries:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+    
+    def pop(self, key: Tuple) -> None:
+        self._data.pop(key, None)
+    
+    def invalidate(self, issue_key: str) -> None:
+        """Drop every entry whose key starts with issue_key"""
+        for key in [key for key in self._data if key[0] == issue_key]:
+            del self._data[key]
+    
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Shared ADF building blocks. Documents built from them are only serialized into
+# request payloads, never mutated, so blank lines can share one paragraph dict.
+# Jira's ADF schema rejects empty text nodes, so blank lines are paragraphs with no content
+_EMPTY_PARAGRAPH = {"type": "paragraph", "content": []}
+
+
+def _paragraph(line: str) -> Dict[str, Any]:
+    return {"type": "paragraph", "content": [{"type": "text", "text": line}]}
+
+
+def text_to_adf(text: str) -> Dict[str, Any]:
+    """
+    Convert plain text to Atlassian Document Format (ADF)
+    
+    Each newline-separated line becomes a paragraph; blank lines (and empty
+    text) become empty paragraphs.
+    
+    Args:
+        text: Plain text string (can include newlines)
+    
+    Returns:
+        Dict in ADF format compatible with Jira Cloud API v3
+    """
+    content = [
+        _paragraph(line) if line.strip() else _EMPTY_PARAGRAPH
+        for line in text.split('\n')
+    ]
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": content
+    }
+
+
+def adf_to_text(document: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Extract the plain text of an Atlassian Document Format (ADF) document
+    
+    Args:
+        document: ADF dict as returned by Jira (may be None)
+    
+    Returns:
+        Concatenated text of the document's paragraphs, or None if there is no document
+    """
+    if not document:
+        return None
+    parts = [
+        part["text"]
+        for para in document.get("content", ())
+        for part in para.get("content", ())
+        if "text" in part
+    ]
+    return "".join(parts)
+
+
+def create_adf_document(content_blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Create a custom Atlassian Document Format (ADF) document
+    
+    Args:
+        content_blocks: List of ADF content blocks (paragraphs, headings, lists, etc.)
+    
+    Returns:
+        Dict in ADF format
+    
+    Example:
+        content_blocks = [
+            {
+                "type": "heading",
+                "attrs": {"level": 1},
+                "content": [{"type": "text", "text": "Title"}]
+            },
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": "Description text"}]
+            }
+        ]
+    """
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": content_blocks
+    }
+
+
+class JiraService:
+    """Wrapper for Jira Cloud REST API v3"""
+    
+    def __init__(self):
+        """Initialize Jira service with credentials from environment variables"""
+        self.email = os.getenv("JIRA_EMAIL")
+        self.api_token = os.getenv("JIRA_API_TOKEN")
+        self.base_url = os.getenv("JIRA_BASE_URL")  # e.g., https://your-domain.atlassian.net
+        
+        if not all([self.email, self.api_token, self.base_url]):
+            raise ValueError(
+                "Missing required environment variables: JIRA_EMAIL, JIRA_API_TOKEN, JIRA_BASE_URL"
+            )
+        
+        self.api_url = f"{self.base_url}/rest/api/3"
+        self.auth = (self.email, self.api_token)
+        # Basic auth header encoded once here rather than by httpx's auth flow per request
+        token = base64.b64encode(f"{self.email}:{self.api_token}".encode()).decode()
+        # Request bodies are pre-encoded with orjson and sent as content=, so the
+        # JSON Content-Type comes from these client-wide headers. Accept-Encoding is
+        # left to httpx, which offers gzip/deflate plus br (brotli extra installed)
+        # and only advertises codecs it can decode.
+        # Read-only: per-request headers (e.g. If-None-Match) are passed separately.
+        self.headers = MappingProxyType({
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": f"Basic {token}"
+        })
+        self._client: Optional[httpx.AsyncClient] = None
+        self._ticket_cache = _TTLCache(CACHE_TTL)
+        self._search_cache = _TTLCache(CACHE_TTL)
+        self._ticket_etags = _TTLCache(ETAG_CACHE_TTL)  # cache_key -> (etag, body)
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._transition_cache = _TTLCache(TRANSITION_CACHE_TTL)
+        # issue_key -> issue type name; writes never change it, so it is not invalidated
+        self._issue_types = _TTLCache(TRANSITION_CACHE_TTL)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP/2 client for Jira calls (created on first use)
+        
+        Headers (including auth) and the API base URL are set on the client, so every
+        request reuses open connections instead of paying a TCP+TLS handshake.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                base_url=self.api_url,
+                http2=True,
+                timeout=httpx.Timeout(10.0, connect=5.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _invalidate(self, issue_key: str) -> None:
+        """Forget cached reads that a write to issue_key may have changed"""
+        self._ticket_cache.invalidate(issue_key)
+        self._ticket_etags.invalidate(issue_key)
+        self._search_cache.clear()
+    
+    async def create_ticket(
+        self,
+        project_key: str,
+        summary: str,
+        description: str,
+        issue_type: str = "Task",
+        priority: Optional[str] = None,
+        assignee: Optional[str] = None,
+        labels: Optional[List[str]] = None,
+        additional_fields: Optional[Dict[str, Any]] = None,
+        initial_comment: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a new Jira ticket
+        
+        Args:
+            project_key: The project key (e.g., "PROJ")
+            summary: The issue summary/title
+            description: The issue description (plain text - will be converted to ADF)
+            issue_type: The issue type (default: "Task")
+            priority: Priority name (e.g., "High", "Medium", "Low")
+            assignee: Account ID of the assignee
+            labels: List of labels to add
+            additional_fields: Additional custom fields to include
+            initial_comment: Comment to add in the same request (plain text - will be converted to ADF)
+            
+        Returns:
+            Dict containing the created issue details including key and id
+        """
+        fields = {
+            "project": {"key": project_key},
+            "summary": summary,
+            "description": text_to_adf(description),  # Convert to Atlassian Document Format
+            "issuetype": {"name": issue_type}
+        }
+        
+        if priority:
+            fields["priority"] = {"name": priority}
+        
+        if assignee:
+            fields["assignee"] = {"accountId": assignee}
+        
+        if labels:
+            fields["labels"] = labels
+        
+        if additional_fields:
+            fields.update(additional_fields)
+        
+        payload = {"fields": fields}
+        
+        # Jira applies the "update" operations on create, saving a separate add_comment round-trip
+        if initial_comment:
+            payload["update"] = {"comment": [{"add": {"body": text_to_adf(initial_comment)}}]}
+        
+        client = self._get_client()
+        response = await client.post("/issue", content=orjson.dumps(payload))
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        # A new issue can match cached searches
+        self._search_cache.clear()
+
+        # Queue notification about created ticket (best-effort, sent in the background)
+        try:
+            issue_key = data.get("key")
+            issue_url = f"{self.base_url}/browse/{issue_key}" if issue_key else None
+            enqueue_jira_notification(
+                action="create",
+                issue_key=issue_key,
+                issue_url=issue_url,
+                summary=summary,
+                description=description,
+                extra={"api_response": data}
+            )
+        except Exception as e:
+            logger = logging.getLogger(__name__)
+            logger.exception(f"Failed to queue notification for created issue {data.get('key')}: {e}")
+
+        return data
+
+    async def update_ticket(
+        self,
+        issue_key: str,
+        summary: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        assignee: Optional[str] = None,
+        labels: Optional[List[str]] = None,
+        additional_fields: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Update an existing Jira ticket
+        
+        Args:
+            issue_key: The issue key (e.g., "PROJ-123")
+            summary: Updated summary/title
+            description: Updated description
+            status: Status name to transition to
+            priority: Priority name to update
+            assignee: Account ID of the new assignee
+            labels: List of labels to set
+            additional_fields: Additional custom fields to update
+            
+        Returns:
+            True if update was successful
+        """
+        fields = {}
+        
+        if summary:
+            fields["summary"] = summary
+        
+        if description:
+            fields["description"] = text_to_adf(description)  # Convert to Atlassian Document Format
+        
+        if priority:
+            fields["priority"] = {"name": priority}
+        
+        if assignee:
+            fields["assignee"] = {"accountId": assignee}
+        
+        if labels:
+            fields["labels"] = labels
+        
+        if additional_fields:
+            fields.update(additional_fields)
+        
+        if fields:
+            payload = {"fields": fields}
+            client = self._get_client()
+            response = await client.put(f"/issue/{issue_key}", content=orjson.dumps(payload))
+            response.raise_for_status()
+            self._invalidate(issue_key)
+
+        # Handle status transition separately if provided. The issue is only
+        # re-read (for the notification) when the caller did not supply both the
+        # new summary and description; that read doesn't depend on the transition,
+        # so both run together.
+        pending = {}
+        if status:
+            pending["transition"] = self._transition_issue(issue_key, status)
+        if summary is None or description is None:
+            pending["issue"] = self.get_ticket(issue_key)
+        results = dict(zip(pending, await asyncio.gather(*pending.values(), return_exceptions=True)))
+        
+        if status:
+            # The concurrent read may have cached the pre-transition status
+            self._invalidate(issue_key)
+            if isinstance(results["transition"], BaseException):
+                raise results["transition"]
+
+        # Queue notification (best effort)
+        try:
+            issue_url = f"{self.base_url}/browse/{issue_key}"
+            summary_text, description_text = summary, description
+            if "issue" in results:
+                issue = results["issue"]
+                if isinstance(issue, BaseException):
+                    raise issue
+                issue_fields = issue.get("fields") or {}
+                if summary_text is None:
+                    summary_text = issue_fields.get("summary")
+                if description_text is None:
+                    description_text = adf_to_text(issue_fields.get("description"))
+            enqueue_jira_notification(
+                action="update",
+                issue_key=issue_key,
+                issue_url=issue_url,
+                summary=summary_text,
+                description=description_text,
+                extra={"updated_fields": list(fields.keys())}
+            )
+        except Exception as e:
+            logger = logging.getLogger(__name__)
+            logger.exception(f"Failed to queue notification for updated issue {issue_key}: {e}")
+
+        return True
+    
+    async def _find_transition_id(self, issue_key: str, target_status: str) -> str:
+        """
+        Look up the transition that moves an issue to target_status (lower-cased)
+        
+        Raises:
+            ValueError: If no transition to that status is available
+        """
+        client = self._get_client()
+        response = await client.get(f"/issue/{issue_key}/transitions")
+        response.raise_for_status()
+        transitions = orjson.loads(response.content)["transitions"]
+        
+        # reversed() so the first transition listed for a status wins, as Jira orders them
+        by_status = {t["to"]["name"].lower(): t["id"] for t in reversed(transitions)}
+        if target_status not in by_status:
+            raise ValueError(f"No transition available to status '{target_status}'")
+        return by_status[target_status]
+    
+    async def _issue_type(self, issue_key: str) -> Optional[str]:
+        """Issue type name of an issue (cached; read via get_ticket on a miss)"""
+        issue_type = self._issue_types.get((issue_key,))
+        if issue_type is None:
+            issue = await self.get_ticket(issue_key)
+            issue_type = ((issue.get("fields") or {}).get("issuetype") or {}).get("name")
+            if issue_type is not None:
+                self._issue_types.set((issue_key,), issue_type)
+        return issue_type
+    
+    async def _transition_issue(self, issue_key: str, status: str) -> bool:
+        """
+        Transition an issue to a new status
+        
+        Transition ids are cached per (project, issue type, status) for
+        JIRA_TRANSITION_CACHE_TTL seconds, since workflows (and so transition ids)
+        differ between issue types. A cached id that Jira rejects (400/404, e.g.
+        the issue is in a different workflow state) is evicted and looked up again.
+        
+        Args:
+            issue_key: The issue key
+            status: The target status name
+            
+        Returns:
+            True if transition was successful
+        """
+        client = self._get_client()
+        target_status = status.lower()
+        cache_key = None
+        if TRANSITION_CACHE_TTL > 0:
+            issue_type = await self._issue_type(issue_key)
+            if issue_type is not None:
+                cache_key = (issue_key.split("-")[0], issue_type, target_status)
+        
+        transition_id = self._transition_cache.get(cache_key) if cache_key else None
+        if transition_id is not None:
+            payload = {"transition": {"id": transition_id}}
+            response = await client.post(f"/issue/{issue_key}/transitions", content=orjson.dumps(payload))
+            if response.status_code in (400, 404):
+                self._transition_cache.pop(cache_key)
+                transition_id = None
+            else:
+                response.raise_for_status()
+        
+        if transition_id is None:
+            transition_id = await self._find_transition_id(issue_key, target_status)
+            payload = {"transition": {"id": transition_id}}
+            response = await client.post(f"/issue/{issue_key}/transitions", content=orjson.dumps(payload))
+            response.raise_for_status()
+            if cache_key:
+                self._transition_cache.set(cache_key, transition_id)
+        
+        self._invalidate(issue_key)
+        return True
+    
+    async def get_ticket(self, issue_key: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get details of a specific ticket
+        
+        Responses are cached for JIRA_CACHE_TTL seconds and dropped when this
+        service writes to the issue. After the TTL expires the request carries
+        If-None-Match, so an unchanged issue comes back as a bodiless 304.
+        Concurrent calls for the same issue share one request.
+        
+        Args:
+            issue_key: The issue key (e.g., "PROJ-123")
+            fields: List of fields to return (default: ISSUE_FIELDS, or all if JIRA_FULL_FIELDS=1)
+            
+        Returns:
+            Dict containing the issue details
+        """
+        params = {}
+        if fields:
+            params["fields"] = ",".join(fields)
+        elif not FULL_FIELDS:
+            params["fields"] = ISSUE_FIELDS
+        
+        cache_key = (issue_key, params.get("fields"))
+        cached = self._ticket_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return await single_flight(
+            self._inflight,
+            ("issue",) + cache_key,
+            lambda: self._fetch_ticket(issue_key, params, cache_key)
+        )
+    
+    async def _fetch_ticket(self, issue_key: str, params: Dict[str, Any], cache_key: Tuple) -> Dict[str, Any]:
+        """Fetch an issue from Jira (revalidating via ETag) and store it in the cache"""
+        validator = self._ticket_etags.get(cache_key)
+        headers = {"If-None-Match": validator[0]} if validator else None
+        
+        client = self._get_client()
+        response = await client.get(f"/issue/{issue_key}", params=params, headers=headers)
+        if response.status_code == 304 and validator:
+            data = validator[1]
+        else:
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            etag = response.headers.get("ETag")
+            if etag:
+                self._ticket_etags.set(cache_key, (etag, data))
+        self._ticket_cache.set(cache_key, data)
+        return data
+    
+    async def add_comment(self, issue_key: str, comment: str) -> Dict[str, Any]:
+        """
+        Add a comment to a ticket
+        
+        Args:
+            issue_key: The issue key (e.g., "PROJ-123")
+            comment: The comment text (plain text - will be converted to ADF)
+            
+        Returns:
+            Dict containing the created comment details
+        """
+        payload = {
+            "body": text_to_adf(comment)  # Convert to Atlassian Document Format
+        }
+        
+        client = self._get_client()
+        response = await client.post(f"/issue/{issue_key}/comment", content=orjson.dumps(payload))
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        self._invalidate(issue_key)
+
+        # Queue notification about the comment being added (best-effort, sent in the background)
+        try:
+            issue_url = f"{self.base_url}/browse/{issue_key}"
+            enqueue_jira_notification(
+                action="comment",
+                issue_key=issue_key,
+                issue_url=issue_url,
+                summary=None,
+                description=comment,
+                extra={"comment_id": data.get("id")}
+            )
+        except Exception as e:
+            logger = logging.getLogger(__name__)
+            logger.exception(f"Failed to queue notification for comment on {issue_key}: {e}")
+
+        return data
+    
+    async def search_tickets(
+        self,
+        jql: str,
+        fields: Optional[List[str]] = None,
+        max_results: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Search for tickets using JQL (cached and deduplicated like get_ticket; any write clears the cache)
+        
+        Args:
+            jql: JQL query string
+            fields: List of fields to return (default: DEFAULT_SEARCH_FIELDS, or all if JIRA_FULL_FIELDS=1)
+            max_results: Maximum number of results to return
+            
+        Returns:
+            Dict containing search results
+        """
+        params = {
+            "jql": jql,
+            "maxResults": max_results
+        }
+        
+        if fields:
+            params["fields"] = ",".join(fields)
+        elif not FULL_FIELDS:
+            params["fields"] = DEFAULT_SEARCH_FIELDS
+        
+        cache_key = (jql, params.get("fields"), max_results)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return await single_flight(
+            self._inflight,
+            ("search",) + cache_key,
+            lambda: self._fetch_search(params, cache_key)
+        )
+    
+    async def _fetch_search(self, params: Dict[str, Any], cache_key: Tuple) -> Dict[str, Any]:
+        """Run a JQL search against Jira and store the result in the cache"""
+        client = self._get_client()
+        response = await client.get("/search", params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        self._search_cache.set(cache_key, data)
+        return data
+
+
+# Convenience function to get a JiraService instance
+@lru_cache(maxsize=1)
+def get_jira_service() -> JiraService:
+    """Get the shared JiraService instance (created on first use)"""
+    return JiraService()
+
+
+async def aclose() -> None:
+    """Flush queued notifications and close the pooled HTTP clients; call on application shutdown"""
+    if get_jira_service.cache_info().currsize:
+        await get_jira_service().aclose()
+    await external_api.aclose()
+
+
+async def create_jira_ticket(
+    project_key: str,
+    summary: str,
+    description: str,
+    issue_type: str,
+    initial_comment: Optional[str] = None
+) -> str:
+    """
+    Function to create Jira Ticket
+    
+    Args:
+        project_key: The project key (e.g., "PROJ")
+        summary: The issue summary/title
+        description: The issue description
+        issue_type: The issue type (e.g., "Task", "Bug", "Story")
+        initial_comment: Optional comment created together with the issue
+    
+    Returns:
+        str: The created issue key (e.g., "PROJ-123")
+    """
+    jira = get_jira_service()
+    result = await jira.create_ticket(
+        project_key=project_key,
+        summary=summary,
+        description=description,
+        issue_type=issue_type,
+        initial_comment=initial_comment
+    )
+    return result["key"]
+
+
+async def update_jira_ticket_with_comment(
+    issue_key: str,
+    comment: str
+) -> bool:
+    """
+    Function to update Jira ticket by adding a comment
+    
+    Args:
+        issue_key: The issue key (e.g., "PROJ-123")
+        comment: The comment text to add
+    
+    Returns:
+        bool: True if comment was added successfully
+    """
+    jira = get_jira_service()
+    await jira.add_comment(issue_key=issue_key, comment=comment)
+    return True
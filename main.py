@@ -8,17 +8,26 @@ from src.config import settings
 
 
 # Configure logger
+# enqueue=True hands records to loguru's writer thread, so request handlers don't
+# block on stdout/file writes; exception variable dumps (diagnose) only when debugging
+_debug_logging = settings.log_level.upper() == "DEBUG"
 logger.remove()
 logger.add(
     sys.stdout,
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level=settings.log_level
+    level=settings.log_level,
+    enqueue=True,
+    backtrace=_debug_logging,
+    diagnose=_debug_logging
 )
 logger.add(
     "logs/jira_assistant.log",
     rotation="500 MB",
     retention="10 days",
-    level=settings.log_level
+    level=settings.log_level,
+    enqueue=True,
+    backtrace=_debug_logging,
+    diagnose=_debug_logging
 )
 
 
@@ -27,26 +36,39 @@ def main():
     logger.info("Starting Jira Assistant...")
     logger.info(f"Configuration: {settings.jira_url} | Project: {settings.jira_project_key}")
     
+    # The file watcher costs CPU and re-imports the whole app on every save,
+    # so auto-reload is only enabled for ENV=development
+    reload_kwargs = {}
+    if settings.env == "development":
+        reload_kwargs = dict(
+            reload=True,  # Auto-reload on code changes
+            reload_dirs=["src"],  # Only watch src directory
+            reload_includes=["*.py"],  # Only watch Python files
+            reload_excludes=[
+                "streamlit_app.py",  # Exclude Streamlit UI
+                "*.sh",  # Exclude shell scripts
+                "*.md",  # Exclude markdown files
+                "data/*",  # Exclude data directory
+                "logs/*",  # Exclude logs
+                "tests/*",  # Exclude tests
+                ".env*",  # Exclude env files
+            ]
+        )
+    
     uvicorn.run(
         "src.api.main:app",
         host=settings.host,
         port=settings.port,
         log_level=settings.log_level.lower(),
-        reload=True,  # Auto-reload on code changes
-        reload_dirs=["src"],  # Only watch src directory
-        reload_includes=["*.py"],  # Only watch Python files
-        reload_excludes=[
-            "streamlit_app.py",  # Exclude Streamlit UI
-            "*.sh",  # Exclude shell scripts
-            "*.md",  # Exclude markdown files
-            "data/*",  # Exclude data directory
-            "logs/*",  # Exclude logs
-            "tests/*",  # Exclude tests
-            ".env*",  # Exclude env files
-        ]
+        # uvloop/httptools (from uvicorn[standard]) instead of the asyncio loop + h11
+        loop="uvloop",
+        http="httptools",
+        # Per-request access lines are a hot path; keep them for development only
+        access_log=settings.env == "development",
+        limit_concurrency=1000,
+        **reload_kwargs
     )
 
-
 if __name__ == "__main__":
     main()
 
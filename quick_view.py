@@ -1,31 +1,68 @@
-"""Quick view of vector database contents"""
+"""Quick view of vector database contents
 
+Usage:
+    python quick_view.py            # summary + first 3 tickets
+    python quick_view.py --export   # also write every ticket to tickets_export.json
+"""
+
+import argparse
+import mmap
 import pickle
-import json
 from pathlib import Path
 
+import orjson
+import pyarrow.parquet as pq
+
 # Load metadata
 metadata_path = Path("./data/vector_store/jira_tickets_metadata.pkl")
+parquet_path = Path("./data/vector_store/jira_tickets_metadata.parquet")
 
-if metadata_path.exists():
+PREVIEW_COUNT = 3
+
+
+def load_tickets():
+    """Load the full ticket metadata list (mmap'd pickle, no extra read buffer)"""
     with open(metadata_path, 'rb') as f:
-        tickets = pickle.load(f)
-    
-    print(f"📊 Total tickets in vector DB: {len(tickets)}\n")
-    
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return pickle.loads(mm)
+
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--export", action="store_true", help="write all tickets to tickets_export.json")
+args = parser.parse_args()
+
+if metadata_path.exists():
+    tickets = None
+    if parquet_path.exists():
+        # Columnar copy: row count from the footer, preview from the first batch only
+        parquet_file = pq.ParquetFile(parquet_path)
+        total = parquet_file.metadata.num_rows
+        preview = next(parquet_file.iter_batches(batch_size=PREVIEW_COUNT), None)
+        preview = preview.to_pylist() if preview is not None else []
+    else:
+        tickets = load_tickets()
+        total = len(tickets)
+        preview = tickets[:PREVIEW_COUNT]
+
+    print(f"📊 Total tickets in vector DB: {total}\n")
+
     # Show first 3 tickets
-    for i, ticket in enumerate(tickets[:3], 1):
+    for i, ticket in enumerate(preview, 1):
         print(f"{i}. {ticket['key']}: {ticket['summary']}")
         print(f"   Status: {ticket['status']} | Priority: {ticket['priority']}")
         print(f"   Description: {ticket['description'][:80]}...")
         print()
-    
-    # Export to JSON for easy viewing
-    with open('tickets_export.json', 'w') as f:
-        json.dump(tickets, f, indent=2, default=str)
-    
-    print(f"✅ Full export saved to: tickets_export.json")
-    print(f"📝 You can open it with any text editor")
+
+    if args.export:
+        # Export to JSON for easy viewing
+        if tickets is None:
+            tickets = load_tickets()
+        with open('tickets_export.json', 'wb') as f:
+            f.write(orjson.dumps(tickets, option=orjson.OPT_INDENT_2, default=str))
+
+        print("✅ Full export saved to: tickets_export.json")
+        print("📝 You can open it with any text editor")
+    else:
+        print("💡 Run with --export to save all tickets to tickets_export.json")
 else:
     print("❌ No vector store found. Run 'python main.py' first to sync tickets.")
-
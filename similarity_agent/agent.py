@@ -4,18 +4,53 @@ This agent finds existing Jira tickets similar to a user's query using semantic
 It analyzes the query, searches the vector store, and provides intelligent recommendations.
 """
 
-from typing import Dict, Any
-from datetime import datetime
+import asyncio
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
 from loguru import logger
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from similarity_agent.state import SimilarityAgentState
 from similarity_agent.nodes import (
     analyze_query_node,
     search_tickets_node,
     analyze_results_node,
-    format_response_node
+    format_response_node,
+    get_embeddings_service
 )
+from src.config.settings import settings
+from src.services.query_cache import QueryCache, QUERY_CACHE_FILE
+
+def _iso_from_ns(ns: int) -> str:
+    """ISO-8601 UTC timestamp for a time.time_ns() value"""
+    return datetime.fromtimestamp(ns / 1e9, timezone.utc).isoformat()
+
+
+# Concurrent graph runs in asearch_batch (each is mostly waiting on OpenAI)
+SEARCH_BATCH_WORKERS = 8
+
+# Queries shorter than this (after stripping) are answered without running the graph
+MIN_QUERY_LENGTH = 3
+
+# Event loop (on a daemon thread) shared by the synchronous wrappers. The shared
+# OpenAI AsyncClient binds to the loop that first uses it, so sync calls must all
+# run on one long-lived loop, not on asyncio.run()'s fresh (then closed) one.
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _run_sync(coro):
+    """Run a coroutine on the shared sync-wrapper loop and wait for its result"""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_sync_loop.run_forever, name="similarity-sync-loop", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
 
 
 class SimilarityAgent:
@@ -28,6 +63,9 @@ class SimilarityAgent:
     3. Analyze and rank the results
     4. Generate a comprehensive response
     
+    The graph nodes are async: use asearch()/asearch_batch() from async code;
+    search()/search_batch() run them on a fresh event loop for sync callers.
+    
     Example:
         >>> agent = SimilarityAgent()
         >>> result = agent.search("User login is failing with 401 error")
@@ -39,6 +77,12 @@ class SimilarityAgent:
     def __init__(self):
         """Initialize the similarity agent with the LangGraph workflow."""
         self.graph = self._build_graph()
+        self.query_cache = QueryCache(
+            max_size=settings.query_cache_size,
+            ttl=settings.query_cache_ttl,
+            threshold=settings.query_cache_threshold,
+            path=settings.vector_store_path / QUERY_CACHE_FILE
+        )
         logger.info("Similarity Agent initialized")
     
     def _build_graph(self) -> StateGraph:
@@ -46,12 +90,10 @@ class SimilarityAgent:
         Build the LangGraph workflow for similarity search.
         
         Graph Structure:
-            START
-              ↓
-          analyze_query ← Understand what user is looking for
-              ↓
-          search_tickets ← Find similar tickets in vector store
-              ↓
+                       START
+                     ↙       ↘
+          analyze_query     search_tickets  ← run in parallel: the LLM analysis
+                     ↘       ↙                overlaps the embedding + vector search
           analyze_results ← Evaluate matches and confidence
               ↓
           format_response ← Create comprehensive response
@@ -69,10 +111,11 @@ class SimilarityAgent:
         workflow.add_node("analyze_results", analyze_results_node)
         workflow.add_node("format_response", format_response_node)
         
-        # Define the flow
-        workflow.set_entry_point("analyze_query")
-        workflow.add_edge("analyze_query", "search_tickets")
-        workflow.add_edge("search_tickets", "analyze_results")
+        # Define the flow: both branches only read user_query, so fan out from
+        # START and join before analyze_results
+        workflow.add_edge(START, "analyze_query")
+        workflow.add_edge(START, "search_tickets")
+        workflow.add_edge(["analyze_query", "search_tickets"], "analyze_results")
         workflow.add_edge("analyze_results", "format_response")
         workflow.add_edge("format_response", END)
         
@@ -90,6 +133,12 @@ class SimilarityAgent:
         """
         Search for similar Jira tickets based on a user query.
         
+        Synchronous wrapper around asearch() (blocks the caller; use asearch()
+        from async code).
+        
+        Results are cached by query embedding, so a near-duplicate query within
+        QUERY_CACHE_TTL seconds returns the earlier result without running the graph.
+        
         Args:
             query: User's search query or problem description
             max_results: Maximum number of similar tickets to return (default: 5)
@@ -112,12 +161,153 @@ class SimilarityAgent:
             >>> for ticket in result["matched_tickets"]:
             ...     print(f"{ticket['key']}: {ticket['summary']}")
         """
+        return _run_sync(self.asearch(query, max_results))
+    
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Async version of search(): OpenAI calls are awaited, not blocking a thread.
+        
+        Args:
+            query: User's search query or problem description
+            max_results: Maximum number of similar tickets to return (default: 5)
+        
+        Returns:
+            Same result dict as search()
+        """
         logger.info(f"Searching for similar tickets: '{query}'")
         
+        if self._is_too_short(query):
+            return self._empty_result(query, reason="query too short")
+        
+        # Embed the query once: it keys the semantic cache and is reused by search_tickets
+        query_embedding = None
+        try:
+            query_embedding = await get_embeddings_service().agenerate_embedding(query)
+        except Exception as e:
+            logger.warning(f"Query cache lookup skipped: {e}")
+        
+        return await self._search_with_embedding(query, max_results, query_embedding)
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        max_results: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar tickets for several queries at once.
+        
+        Synchronous wrapper around asearch_batch() (blocks the caller; use
+        asearch_batch() from async code).
+        
+        Args:
+            queries: User queries to search for
+            max_results: Maximum number of similar tickets to return per query
+        
+        Returns:
+            One result dict per query, in input order (same shape as search())
+        """
+        return _run_sync(self.asearch_batch(queries, max_results))
+    
+    async def asearch_batch(
+        self,
+        queries: List[str],
+        max_results: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of search_batch().
+        
+        Duplicate queries are searched once, unique queries missing from the
+        embedding caches are embedded in a single OpenAI request, and up to SEARCH_BATCH_WORKERS per-query graphs
+        (LLM calls and vector search) run concurrently.
+        
+        Args:
+            queries: User queries to search for
+            max_results: Maximum number of similar tickets to return per query
+        
+        Returns:
+            One result dict per query, in input order (same shape as search())
+        """
+        unique_queries = list(dict.fromkeys(queries))
+        logger.info(f"Batch search for {len(unique_queries)} unique queries")
+        
+        by_query = {
+            query: self._empty_result(query, reason="query too short")
+            for query in unique_queries if self._is_too_short(query)
+        }
+        unique_queries = [query for query in unique_queries if query not in by_query]
+        if not unique_queries:
+            return [by_query[query] for query in queries]
+        
+        try:
+            embeddings = [
+                row.tolist() for row in await get_embeddings_service().agenerate_embeddings(unique_queries)
+            ]
+        except Exception as e:
+            logger.warning(f"Batch query embedding failed, embedding per query: {e}")
+            embeddings = [None] * len(unique_queries)
+        
+        semaphore = asyncio.Semaphore(SEARCH_BATCH_WORKERS)
+        
+        async def run_one(query: str, query_embedding: Optional[List[float]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._search_with_embedding(query, max_results, query_embedding)
+        
+        results = await asyncio.gather(*(
+            run_one(query, embedding) for query, embedding in zip(unique_queries, embeddings)
+        ))
+        
+        by_query.update(zip(unique_queries, results))
+        return [by_query[query] for query in queries]
+    
+    @staticmethod
+    def _is_too_short(query: str) -> bool:
+        return not query or len(query.strip()) < MIN_QUERY_LENGTH
+    
+    def _empty_result(self, query: str, reason: str) -> Dict[str, Any]:
+        """Build the no-matches result for a query that isn't worth searching."""
+        logger.info(f"Skipping search for '{query}': {reason}")
+        return {
+            "matched_tickets": [],
+            "message": (
+                f"No search performed ({reason}). Please describe the issue in more detail "
+                f"so similar tickets can be found."
+            ),
+            "has_matches": False,
+            "total_matches": 0,
+            "confidence_level": "none",
+            "best_match": None,
+            "query_analysis": None,
+            "timestamp": _iso_from_ns(time.time_ns()),
+            "error": None
+        }
+    
+    async def _search_with_embedding(
+        self,
+        query: str,
+        max_results: int,
+        query_embedding: Optional[List[float]]
+    ) -> Dict[str, Any]:
+        """Serve a query from the semantic cache, or run the graph and cache the result."""
+        # Stamped once per search: cache hits, graph results and errors all share it
+        timestamp = _iso_from_ns(time.time_ns())
+        query_vec = None
+        if query_embedding is not None:
+            query_vec = QueryCache.normalize(query_embedding)
+            cached = self.query_cache.get(query_vec, max_results)
+            if cached is not None:
+                logger.info("Query cache hit: returning cached search result")
+                cached["timestamp"] = timestamp
+                return cached
+        
         # Initialize state
         initial_state: SimilarityAgentState = {
             "user_query": query,
             "max_results": max_results,
+            "query_embedding": query_embedding,
             "query_analysis": None,
             "search_keywords": None,
             "matched_tickets": [],
@@ -126,13 +316,13 @@ class SimilarityAgent:
             "has_matches": False,
             "response_message": "",
             "confidence_level": "none",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "error": None
         }
         
         try:
             # Execute the graph
-            final_state = self.graph.invoke(initial_state)
+            final_state = await self.graph.ainvoke(initial_state)
             
             logger.info(
                 f"Search complete: found {final_state['total_matches']} matches, "
@@ -140,7 +330,7 @@ class SimilarityAgent:
             )
             
             # Return with clear structure: matched_tickets and message
-            return {
+            result = {
                 "matched_tickets": final_state["matched_tickets"],
                 "message": final_state["response_message"],
                 "has_matches": final_state["has_matches"],
@@ -151,6 +341,9 @@ class SimilarityAgent:
                 "timestamp": final_state["timestamp"],
                 "error": final_state.get("error")
             }
+            if query_vec is not None and not result["error"]:
+                self.query_cache.put(query_vec, max_results, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error executing similarity search: {e}")
@@ -162,7 +355,7 @@ class SimilarityAgent:
                 "confidence_level": "none",
                 "best_match": None,
                 "query_analysis": None,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "error": str(e)
             }
     
@@ -176,16 +369,14 @@ class SimilarityAgent:
         return """
 Similarity Agent Graph:
 
-    START
-      ↓
-  ┌─────────────────┐
-  │ analyze_query   │ ← Parse user query and extract keywords
-  └─────────────────┘
-      ↓
-  ┌─────────────────┐
-  │ search_tickets  │ ← Search vector store for similar tickets
-  └─────────────────┘
-      ↓
+                 START
+           ↙             ↘
+  ┌─────────────────┐  ┌─────────────────┐
+  │ analyze_query   │  │ search_tickets  │  (run in parallel)
+  └─────────────────┘  └─────────────────┘
+   Parse user query     Search vector store
+   and extract keywords for similar tickets
+           ↘             ↙
   ┌─────────────────┐
   │ analyze_results │ ← Evaluate matches and confidence level
   └─────────────────┘
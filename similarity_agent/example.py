@@ -2,13 +2,13 @@
 
 This script demonstrates how to use the Similarity Agent to search for
 existing Jira tickets based on user queries.
+
+Usage (from the project root, so the package imports resolve):
+    python -m similarity_agent.example                 # run the example searches
+    python -m similarity_agent.example --interactive   # type your own queries
 """
 
 import sys
-from pathlib import Path
-
-# Add parent directory to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
 
 from similarity_agent.agent import SimilarityAgent
 from loguru import logger
@@ -37,14 +37,14 @@ def main():
     print("Running example searches...\n")
     print("NOTE: The agent will return matched Jira tickets with full details.\n")
     
-    for i, query in enumerate(example_queries, 1):
+    # Search for all example queries at once (one embedding call, concurrent searches)
+    results = agent.search_batch(example_queries, max_results=3)
+    
+    for i, (query, result) in enumerate(zip(example_queries, results), 1):
         print(f"\n{'='*80}")
         print(f"Example {i}: {query}")
         print('='*80)
         
-        # Search for similar tickets
-        result = agent.search(query=query, max_results=3)
-        
         # Display results
         print(f"\n{result['message']}")
         
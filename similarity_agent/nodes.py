@@ -1,49 +1,40 @@
 """Node functions for the Similarity Agent graph"""
 
-import json
-from datetime import datetime
-from typing import Dict, Any
+import asyncio
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 from loguru import logger
-from langchain_openai import ChatOpenAI
+import numpy as np
+import orjson
 
 from similarity_agent.state import SimilarityAgentState, MatchedTicket
 from similarity_agent.prompts import (
-    QUERY_ANALYZER_PROMPT,
-    RESULT_ANALYZER_PROMPT
+    render_query_analyzer_prompt,
+    render_result_analyzer_prompt
 )
-
-# Import services from main project
-import sys
-from pathlib import Path
-
-# Add parent directory to path for imports
-project_root = Path(__file__).parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
-
-from src.services.vector_store import VectorStore
-from src.services.embeddings_service import EmbeddingsService
 from src.config.settings import settings
+from src.services.clients import get_llm, get_vector_store, get_embeddings_service
 
-print('open ai key: ', settings.openai_api_key)
+# JSON object/array inside a ``` or ```json fence in an LLM reply
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```", re.DOTALL)
 
-# Initialize services
-llm = ChatOpenAI(
-    model=settings.openai_model,
-    temperature=0,
-    openai_api_key=settings.openai_api_key
-)
 
-vector_store = VectorStore()
-embeddings_service = EmbeddingsService()
+def _parse_llm_json(content: str) -> Any:
+    """Parse the JSON payload of an LLM reply, fenced in a markdown code block or bare."""
+    match = _JSON_FENCE.search(content)
+    return orjson.loads(match.group(1) if match else content)
 
 
-def analyze_query_node(state: SimilarityAgentState) -> SimilarityAgentState:
+async def analyze_query_node(state: SimilarityAgentState) -> Dict[str, Any]:
     """
     Analyze the user query to extract key components and keywords.
     
     This node uses an LLM to understand what the user is looking for
     and extract relevant information for searching.
+    
+    Runs in parallel with search_tickets_node, so it returns only the keys it
+    sets (query_analysis, search_keywords) rather than the whole state.
     """
     logger.info("Node: Analyzing user query")
     
@@ -51,43 +42,39 @@ def analyze_query_node(state: SimilarityAgentState) -> SimilarityAgentState:
     
     try:
         # Use LLM to analyze the query
-        prompt = QUERY_ANALYZER_PROMPT.format(query=query)
-        response = llm.invoke(prompt)
+        prompt = render_query_analyzer_prompt(query=query)
+        response = await get_llm().ainvoke(prompt)
         
         # Parse JSON response
-        content = response.content
-        
-        # Extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        analysis = json.loads(content)
-        
-        state["query_analysis"] = analysis
-        state["search_keywords"] = analysis.get("keywords", [])
+        analysis = _parse_llm_json(response.content)
         
         logger.info(f"Query analysis complete: {analysis.get('main_topic', 'Unknown')}")
+        return {
+            "query_analysis": analysis,
+            "search_keywords": analysis.get("keywords", [])
+        }
         
     except Exception as e:
         logger.error(f"Error analyzing query: {e}")
         # Fallback: use the query as-is
-        state["query_analysis"] = {
-            "main_topic": query,
-            "keywords": query.split()
+        return {
+            "query_analysis": {
+                "main_topic": query,
+                "keywords": query.split()
+            },
+            "search_keywords": query.split()
         }
-        state["search_keywords"] = query.split()
-    
-    return state
 
 
-def search_tickets_node(state: SimilarityAgentState) -> SimilarityAgentState:
+async def search_tickets_node(state: SimilarityAgentState) -> Dict[str, Any]:
     """
     Search for similar tickets using vector similarity.
     
     This node performs semantic search on the vector store to find
     tickets that match the user's query.
+    
+    Runs in parallel with analyze_query_node (it only needs user_query), so it
+    returns only the keys it sets rather than the whole state.
     """
     logger.info("Node: Searching for similar tickets")
     
@@ -95,22 +82,24 @@ def search_tickets_node(state: SimilarityAgentState) -> SimilarityAgentState:
     max_results = state.get("max_results", 5)
     
     try:
-        # Generate embedding for the query
-        logger.info("Generating query embedding...")
-        query_embedding = embeddings_service.generate_embedding(query)
+        # Generate embedding for the query (unless the agent already did)
+        query_embedding = state.get("query_embedding")
+        if query_embedding is None:
+            logger.info("Generating query embedding...")
+            query_embedding = await get_embeddings_service().agenerate_embedding(query)
         
-        # Search vector store
+        # Search vector store (FAISS is CPU-bound, so keep it off the event loop)
         logger.info(f"Searching vector store (max_results={max_results})...")
-        results = vector_store.search(
+        _, scores, payloads = await asyncio.to_thread(
+            get_vector_store().search_batched,
             query_embedding=query_embedding,
             k=max_results,
             threshold=settings.similarity_threshold
         )
         
-        # Format results
-        matched_tickets = []
-        for ticket_dict, score in results:
-            matched_ticket: MatchedTicket = {
+        # Format results (scores rounded for the whole batch at once)
+        matched_tickets: List[MatchedTicket] = [
+            {
                 "key": ticket_dict.get("key", ""),
                 "summary": ticket_dict.get("summary", ""),
                 "description": ticket_dict.get("description", ""),
@@ -118,34 +107,36 @@ def search_tickets_node(state: SimilarityAgentState) -> SimilarityAgentState:
                 "priority": ticket_dict.get("priority", ""),
                 "status": ticket_dict.get("status", ""),
                 "labels": ticket_dict.get("labels", []),
-                "similarity_score": round(score, 4),
+                "similarity_score": score,
                 "match_reason": None  # Will be filled by result analyzer
             }
-            matched_tickets.append(matched_ticket)
-        
-        state["matched_tickets"] = matched_tickets
-        state["total_matches"] = len(matched_tickets)
-        state["has_matches"] = len(matched_tickets) > 0
+            for ticket_dict, score in zip(payloads, np.round(scores.astype(np.float64), 4).tolist())
+        ]
         
         if matched_tickets:
-            state["best_match"] = matched_tickets[0]  # Highest score
             logger.info(f"Found {len(matched_tickets)} matching tickets")
         else:
-            state["best_match"] = None
             logger.info("No matching tickets found")
         
+        return {
+            "matched_tickets": matched_tickets,
+            "total_matches": len(matched_tickets),
+            "has_matches": len(matched_tickets) > 0,
+            "best_match": matched_tickets[0] if matched_tickets else None  # Highest score
+        }
+        
     except Exception as e:
         logger.error(f"Error searching tickets: {e}")
-        state["matched_tickets"] = []
-        state["total_matches"] = 0
-        state["has_matches"] = False
-        state["best_match"] = None
-        state["error"] = str(e)
-    
-    return state
+        return {
+            "matched_tickets": [],
+            "total_matches": 0,
+            "has_matches": False,
+            "best_match": None,
+            "error": str(e)
+        }
 
 
-def analyze_results_node(state: SimilarityAgentState) -> SimilarityAgentState:
+async def analyze_results_node(state: SimilarityAgentState) -> SimilarityAgentState:
     """
     Analyze search results and generate a helpful response.
     
@@ -167,6 +158,36 @@ def analyze_results_node(state: SimilarityAgentState) -> SimilarityAgentState:
         logger.info("No matches to analyze")
         return state
     
+    # Decisive scores don't need the LLM to judge confidence
+    best_match = matched_tickets[0]
+    top_score = best_match["similarity_score"]
+    if top_score >= settings.llm_skip_high_tau:
+        reason = f"High semantic similarity (score ≥ {settings.llm_skip_high_tau:g})"
+        for ticket in matched_tickets:
+            if ticket["similarity_score"] >= settings.llm_skip_high_tau:
+                ticket["match_reason"] = reason
+        others = len(matched_tickets) - 1
+        state["confidence_level"] = "high"
+        state["response_message"] = (
+            f"Found a strong match for your query: {best_match['key']}: {best_match['summary']} "
+            f"(similarity: {top_score:.2%})."
+            + (f" {others} other related ticket(s) were also found." if others else "")
+        )
+        logger.info(f"Skipped result analysis LLM call: top score {top_score:.3f} is high")
+        return state
+    if top_score < settings.llm_skip_low_tau:
+        reason = f"Low semantic similarity (score < {settings.llm_skip_low_tau:g})"
+        for ticket in matched_tickets:
+            ticket["match_reason"] = reason
+        state["confidence_level"] = "low"
+        state["response_message"] = (
+            f"Found {len(matched_tickets)} loosely related ticket(s), but none closely match your query: '{query}'. "
+            f"The closest is {best_match['key']}: {best_match['summary']} (similarity: {top_score:.2%}). "
+            f"This may be a new issue; consider creating a new ticket."
+        )
+        logger.info(f"Skipped result analysis LLM call: top score {top_score:.3f} is low")
+        return state
+    
     try:
         # Format search results for analysis
         results_summary = []
@@ -182,22 +203,14 @@ def analyze_results_node(state: SimilarityAgentState) -> SimilarityAgentState:
             })
         
         # Use LLM to analyze results
-        prompt = RESULT_ANALYZER_PROMPT.format(
+        prompt = render_result_analyzer_prompt(
             query=query,
-            search_results=json.dumps(results_summary, indent=2)
+            search_results=orjson.dumps(results_summary, option=orjson.OPT_INDENT_2).decode()
         )
-        response = llm.invoke(prompt)
+        response = await get_llm().ainvoke(prompt)
         
         # Parse JSON response
-        content = response.content
-        
-        # Extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        analysis = json.loads(content)
+        analysis = _parse_llm_json(response.content)
         
         # Update state with analysis
         state["confidence_level"] = analysis.get("confidence_level", "medium")
@@ -228,6 +241,27 @@ def analyze_results_node(state: SimilarityAgentState) -> SimilarityAgentState:
     return state
 
 
+_NO_MATCHES_FOOTER = "\n\n💡 **Next Steps**: No existing tickets found. You should create a new ticket for this issue."
+
+
+@lru_cache(maxsize=64)
+def _response_frame(count: int) -> Tuple[str, str]:
+    """
+    Header and footer for a response listing `count` tickets.
+    
+    Only the count varies, so the pluralized text is built once per count
+    rather than on every response.
+    """
+    plural = count > 1
+    header = f"\n\n**📋 Returning {count} Matched Ticket{'s' if plural else ''}:**\n"
+    footer = (
+        f"\n\n💡 **Next Steps**: Review the above ticket{'s' if plural else ''} "
+        f"to see if {'any of them address' if plural else 'it addresses'} your needs. "
+        f"You can add comments, link to {'them' if plural else 'it'}, or create a new ticket if needed."
+    )
+    return header, footer
+
+
 def format_response_node(state: SimilarityAgentState) -> SimilarityAgentState:
     """
     Format the final response with all ticket details.
@@ -242,46 +276,34 @@ def format_response_node(state: SimilarityAgentState) -> SimilarityAgentState:
     response_parts = [state["response_message"]]
     
     if matched_tickets:
-        response_parts.append(f"\n\n**📋 Returning {len(matched_tickets)} Matched Ticket{'s' if len(matched_tickets) > 1 else ''}:**\n")
+        header, footer = _response_frame(len(matched_tickets))
+        response_parts.append(header)
         
         for i, ticket in enumerate(matched_tickets, 1):
-            # Format ticket details clearly
-            ticket_info = [
+            # Ticket lines go straight into response_parts; everything is joined once below
+            desc = ticket['description']
+            response_parts.extend([
                 f"\n{i}. **{ticket['key']}** (Similarity: {ticket['similarity_score']:.1%})",
                 f"   - **Summary**: {ticket['summary']}",
-                f"   - **Type**: {ticket['issue_type']} | **Priority**: {ticket['priority']} | **Status**: {ticket['status']}"
-            ]
-            
-            # Add description (truncated if too long)
-            desc = ticket['description']
-            if len(desc) > 200:
-                ticket_info.append(f"   - **Description**: {desc[:200]}...")
-            else:
-                ticket_info.append(f"   - **Description**: {desc}")
+                f"   - **Type**: {ticket['issue_type']} | **Priority**: {ticket['priority']} | **Status**: {ticket['status']}",
+                # Description truncated if too long
+                f"   - **Description**: {desc[:200]}{'...' if len(desc) > 200 else ''}",
+            ])
             
             # Add match reason if available
             if ticket.get("match_reason"):
-                ticket_info.append(f"   - **Why it matched**: {ticket['match_reason']}")
+                response_parts.append(f"   - **Why it matched**: {ticket['match_reason']}")
             
             # Add labels if available
             if ticket.get("labels"):
-                ticket_info.append(f"   - **Labels**: {', '.join(ticket['labels'])}")
-            
-            response_parts.append("\n".join(ticket_info))
+                response_parts.append(f"   - **Labels**: {', '.join(ticket['labels'])}")
         
         # Add helpful footer
-        response_parts.append(
-            f"\n\n💡 **Next Steps**: Review the above ticket{'s' if len(matched_tickets) > 1 else ''} "
-            f"to see if {'any of them address' if len(matched_tickets) > 1 else 'it addresses'} your needs. "
-            f"You can add comments, link to {'them' if len(matched_tickets) > 1 else 'it'}, or create a new ticket if needed."
-        )
+        response_parts.append(footer)
     else:
-        response_parts.append(
-            f"\n\n💡 **Next Steps**: No existing tickets found. You should create a new ticket for this issue."
-        )
+        response_parts.append(_NO_MATCHES_FOOTER)
     
     state["response_message"] = "\n".join(response_parts)
-    state["timestamp"] = datetime.now().isoformat()
     
     logger.info(f"Response formatted successfully with {len(matched_tickets)} ticket(s)")
     
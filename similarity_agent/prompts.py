@@ -1,5 +1,8 @@
 """Prompt templates for the Similarity Agent"""
 
+from string import Formatter
+from typing import Callable, List, Tuple
+
 QUERY_ANALYZER_PROMPT = """You are an expert at analyzing user queries about Jira tickets.
 
 Your task is to analyze the user's query and extract key components that will help find similar existing tickets.
@@ -225,3 +228,24 @@ Return matches that are:
 - Addressing similar user needs
 """
 
+
+def _compile_prompt(template: str) -> Callable[..., str]:
+    """
+    Pre-split a str.format template into literal text and field names.
+    
+    Parsing (including {{ }} unescaping) happens once at import; the returned
+    renderer only concatenates strings. Fields must be plain names with values
+    that are already strings.
+    """
+    parts: List[Tuple[str, str]] = [
+        (literal, field or "") for literal, field, _, _ in Formatter().parse(template)
+    ]
+    
+    def render(**values: str) -> str:
+        return "".join([literal + (values[field] if field else "") for literal, field in parts])
+    
+    return render
+
+
+render_query_analyzer_prompt = _compile_prompt(QUERY_ANALYZER_PROMPT)
+render_result_analyzer_prompt = _compile_prompt(RESULT_ANALYZER_PROMPT)
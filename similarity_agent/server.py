@@ -5,54 +5,168 @@ Run this server to use the Similarity Agent as a standalone API service.
 Usage:
     python -m similarity_agent.server
 
-The server will start on http://localhost:8001
+The server will start on http://localhost:8001 with a single uvloop/httptools
+worker process.
+
+Scaling out: set SIMILARITY_SERVER_WORKERS=N to run N worker processes. Each
+worker loads its own FAISS index and LLM/embedding clients and keeps its own
+response cache, in-flight search map and query cache, so memory grows roughly
+N-fold and identical concurrent searches are only deduplicated within a
+worker. Size N to the available memory, not the core count.
 """
 
-import sys
-from pathlib import Path
-from typing import Optional
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 
-# Add parent directory to path
-project_root = Path(__file__).parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
-
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 from pydantic import BaseModel, Field
 from loguru import logger
 
 from similarity_agent import SimilarityAgent
+from similarity_agent.nodes import get_vector_store
+from src.utils.single_flight import single_flight
+
+
+# Second-resolution timestamp for responses, refreshed by a background task
+# instead of formatting datetime.now() on every request
+_clock = {"now": datetime.now().isoformat()}
+
+
+async def _tick_clock() -> None:
+    while True:
+        _clock["now"] = datetime.now().isoformat()
+        await asyncio.sleep(1)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the agent and load the vector store in each worker before it serves requests."""
+    logger.info("="*80)
+    logger.info("Starting Similarity Agent API Server")
+    logger.info("="*80)
+    
+    try:
+        # Initialize agent
+        await get_agent()
+        await asyncio.to_thread(get_vector_store)
+        logger.info("✓ Similarity Agent initialized successfully")
+        logger.info("✓ Server ready to accept requests")
+        logger.info("="*80)
+    except Exception as e:
+        logger.error(f"✗ Failed to initialize agent: {e}")
+        logger.error("Server may not function correctly")
+    
+    clock_task = asyncio.create_task(_tick_clock())
+    
+    yield
+    
+    logger.info("Shutting down Similarity Agent API Server")
+    clock_task.cancel()
 
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Similarity Agent API",
     description="Search for similar Jira tickets using semantic search",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Add CORS middleware: only the methods/headers the API uses, origins from
+# SIMILARITY_CORS_ORIGINS (comma-separated, default any), and preflight results
+# cached by browsers for 10 minutes
+_cors_origins = [o.strip() for o in os.getenv("SIMILARITY_CORS_ORIGINS", "*").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=_cors_origins,
+    allow_credentials="*" not in _cors_origins,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
+    max_age=600,
 )
 
-# Initialize the agent (singleton)
+# Read-only endpoint bodies, serialized once
+_ROOT_BODY = orjson.dumps({
+    "name": "Similarity Agent API",
+    "version": "1.0.0",
+    "description": "Search for similar Jira tickets using semantic search",
+    "endpoints": {
+        "search": "/search",
+        "health": "/health",
+        "docs": "/docs"
+    }
+})
+_graph_body: Optional[bytes] = None
+
+# Initialize the agent (singleton, created in lifespan)
 agent: Optional[SimilarityAgent] = None
+_agent_lock = asyncio.Lock()
+
+
+# Exact-match /search cache: a repeat of the same (normalized query, max_results)
+# within RESPONSE_CACHE_TTL seconds gets the earlier result without any
+# embedding or LLM call, and identical concurrent requests share one search
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = 300.0
+_response_cache: "OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_inflight_searches: Dict[Tuple[str, int], asyncio.Future] = {}
+
+
+def _cached_result(key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if time.monotonic() >= expires_at:
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return result
+
+
+def _cache_result(key: Tuple[str, int], result: Dict[str, Any]) -> None:
+    _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, result)
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+async def _search_once(query: str, max_results: int) -> Dict[str, Any]:
+    """Run a search, reusing a cached or in-flight result for the same normalized request."""
+    key = (" ".join(query.lower().split()), max_results)
+    cached = _cached_result(key)
+    if cached is not None:
+        logger.info("Search response cache hit")
+        return cached
+    
+    async def search() -> Dict[str, Any]:
+        agent_instance = await get_agent()
+        result = await agent_instance.asearch(query=query, max_results=max_results)
+        if not result.get("error"):
+            _cache_result(key, result)
+        return result
+    
+    return await single_flight(_inflight_searches, key, search)
 
 
-def get_agent() -> SimilarityAgent:
-    """Get or create the similarity agent instance."""
+async def get_agent() -> SimilarityAgent:
+    """Get or create the similarity agent instance (concurrent first calls build it once)."""
     global agent
     if agent is None:
-        logger.info("Initializing Similarity Agent...")
-        agent = SimilarityAgent()
-        logger.info("Similarity Agent ready")
+        async with _agent_lock:
+            if agent is None:
+                logger.info("Initializing Similarity Agent...")
+                agent = await asyncio.to_thread(SimilarityAgent)
+                logger.info("Similarity Agent ready")
     return agent
 
 
@@ -129,23 +243,14 @@ class HealthResponse(BaseModel):
 @app.get("/", tags=["Info"])
 async def root():
     """Root endpoint with API information."""
-    return {
-        "name": "Similarity Agent API",
-        "version": "1.0.0",
-        "description": "Search for similar Jira tickets using semantic search",
-        "endpoints": {
-            "search": "/search",
-            "health": "/health",
-            "docs": "/docs"
-        }
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Health check endpoint."""
     try:
-        agent_instance = get_agent()
+        agent_instance = await get_agent()
         agent_ready = agent_instance is not None
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -154,7 +259,7 @@ async def health_check():
     return {
         "status": "healthy" if agent_ready else "unhealthy",
         "agent_ready": agent_ready,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _clock["now"]
     }
 
 
@@ -193,14 +298,8 @@ async def search_similar_tickets(request: SearchRequest):
     try:
         logger.info(f"Search request: query='{request.query}', max_results={request.max_results}")
         
-        # Get the agent
-        agent_instance = get_agent()
-        
-        # Perform search
-        result = agent_instance.search(
-            query=request.query,
-            max_results=request.max_results
-        )
+        # Perform search (served from the response cache when possible)
+        result = await _search_once(request.query, request.max_results)
         
         logger.info(
             f"Search complete: found {result['total_matches']} matches, "
@@ -228,11 +327,14 @@ async def search_similar_tickets(request: SearchRequest):
 @app.get("/graph", tags=["Info"])
 async def get_graph_structure():
     """Get the agent's graph structure."""
+    global _graph_body
     try:
-        agent_instance = get_agent()
-        return {
-            "graph": agent_instance.get_graph_visualization()
-        }
+        if _graph_body is None:
+            agent_instance = await get_agent()
+            _graph_body = orjson.dumps({
+                "graph": agent_instance.get_graph_visualization()
+            })
+        return Response(_graph_body, media_type="application/json")
     except Exception as e:
         logger.error(f"Failed to get graph structure: {e}")
         raise HTTPException(
@@ -241,31 +343,6 @@ async def get_graph_structure():
         )
 
 
-# Startup/Shutdown Events
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the agent on startup."""
-    logger.info("="*80)
-    logger.info("Starting Similarity Agent API Server")
-    logger.info("="*80)
-    
-    try:
-        # Initialize agent
-        get_agent()
-        logger.info("✓ Similarity Agent initialized successfully")
-        logger.info("✓ Server ready to accept requests")
-        logger.info("="*80)
-    except Exception as e:
-        logger.error(f"✗ Failed to initialize agent: {e}")
-        logger.error("Server may not function correctly")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown."""
-    logger.info("Shutting down Similarity Agent API Server")
-
-
 # Main entry point
 if __name__ == "__main__":
     import uvicorn
@@ -275,10 +352,15 @@ if __name__ == "__main__":
     logger.info("API documentation at: http://localhost:8001/docs")
     logger.info("Press Ctrl+C to stop")
     
+    # Workers need the app as an import string; each one runs the lifespan and
+    # warms its own agent (see the module docstring before raising the count)
     uvicorn.run(
-        app,
+        "similarity_agent.server:app",
         host="0.0.0.0",
         port=8001,
+        workers=int(os.getenv("SIMILARITY_SERVER_WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
 
@@ -23,6 +23,7 @@ class SimilarityAgentState(TypedDict):
     # Input
     user_query: str
     max_results: int  # Maximum number of results to return
+    query_embedding: Optional[List[float]]  # Precomputed embedding of user_query, if any
     
     # Query Analysis
     query_analysis: Optional[Dict[str, Any]]  # Parsed query components
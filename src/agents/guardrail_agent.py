@@ -1,20 +1,78 @@
 """Guardrail agent for validating user requests"""
 
-from langchain_openai import ChatOpenAI
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
 from langchain.prompts import ChatPromptTemplate
 from loguru import logger
 
 from src.models import AgentState
 from src.config import settings
+from src.services.clients import get_embeddings_service, get_llm
+from src.services.query_cache import QueryCache
+from src.utils.single_flight import single_flight
+
+# File (in the vector store directory) persisting guardrail verdicts across restarts
+GUARDRAIL_CACHE_FILE = "guardrail_cache.sqlite"
+
+# Short ticket-creation follow-ups ("create new ticket", "yes, create it") that are
+# always valid; anything with more content still goes through the LLM
+_FAST_VALID = re.compile(
+    r"^\s*(?:yes,?\s+)?(?:please\s+)?(?:create|add|make)\s+(?:a\s+|the\s+)?(?:new\s+)?ticket"
+    r"(?:\s+for\s+(?:this|it|that))?\s*[.!]?\s*$"
+    r"|^\s*(?:yes,?\s+)?(?:please\s+)?(?:create|do)\s+it\s*[.!]?\s*$",
+    re.IGNORECASE
+)
+
+# Simple greetings and help/capability questions, answered without the LLM
+_GREETING_RE = re.compile(r"^\s*(?:hi|hello|hey|good (?:morning|afternoon|evening)|greetings)\b", re.IGNORECASE)
+_HELP_RE = re.compile(
+    r"\b(?:help|what can you do|how can you help|what do you do|capabilities|features)\b",
+    re.IGNORECASE
+)
 
+GREETING_RESPONSE = (
+    "Hello! 👋 I'm your Jira assistant. I can help you:\n\n"
+    "- 🔍 **Search** for existing tickets\n"
+    "- ➕ **Create** new tickets\n"
+    "- ✏️ **Update** existing tickets\n\n"
+    "What would you like to do today?"
+)
 
-# Initialize LLM
-llm = ChatOpenAI(
-    model=settings.openai_model,
-    temperature=0,
-    openai_api_key=settings.openai_api_key
+HELP_RESPONSE = (
+    "I'm your Jira assistant! Here's what I can do:\n\n"
+    "🔍 **Search for tickets**\n"
+    "   - \"Find tickets about login issues\"\n"
+    "   - \"Show me all high priority bugs\"\n\n"
+    "➕ **Create new tickets**\n"
+    "   - \"Create a task for implementing dark mode\"\n"
+    "   - \"Create a bug for the payment gateway error\"\n\n"
+    "✏️ **Update existing tickets**\n"
+    "   - \"Update SCRUM-42 with a comment: completed\"\n"
+    "   - \"Add a comment to SCRUM-15\"\n\n"
+    "Just ask me naturally, and I'll help you manage your Jira tickets!"
 )
 
+# Entities masked out of a query to get its structural template, so
+# "update SCRUM-42 priority to 2" and "update SCRUM-7 priority to 3" share a verdict.
+# Only the first ticket key and the first number are masked, so a bulk variant
+# ("close SCRUM-1 2 3 ...") gets its own template and is re-checked. Free text
+# (including quoted text) is kept, since that is what the guardrail judges.
+_TICKET_KEY = re.compile(r"\b[A-Z][A-Z0-9]*-\d+\b", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+")
+
+# Exact-match cache of VALID verdicts by template hash (checked before the embedding cache)
+_template_cache: "OrderedDict[str, float]" = OrderedDict()
+
+# Guardrail LLM calls in flight, so concurrent identical queries share one call
+_inflight: Dict[str, asyncio.Future] = {}
+
 
 GUARDRAIL_PROMPT = ChatPromptTemplate.from_messages([
     ("system", """You are a guardrail agent for a Jira assistance chatbot. Your role is to validate user requests.
@@ -44,6 +102,82 @@ Be permissive and allow conversational queries. When in doubt, allow the request
 ])
 
 
+@lru_cache(maxsize=1)
+def _get_chain():
+    """Guardrail chain, built once (on first use) and shared by all requests"""
+    return GUARDRAIL_PROMPT | get_llm()
+
+
+def _semantic_cache_enabled() -> bool:
+    """Whether VALID verdicts are also reused for near-identical (not just same-text) queries"""
+    return settings.guardrail_cache_size > 0 and settings.guardrail_cache_threshold < 1.0
+
+
+@lru_cache(maxsize=1)
+def _get_verdict_cache() -> QueryCache:
+    """Semantic cache of VALID verdicts, keyed by query embedding (opt-in)"""
+    return QueryCache(
+        max_size=settings.guardrail_cache_size,
+        ttl=settings.guardrail_cache_ttl,
+        threshold=settings.guardrail_cache_threshold,
+        path=settings.vector_store_path / GUARDRAIL_CACHE_FILE
+    )
+
+
+async def _embed(query: str) -> Optional[np.ndarray]:
+    """
+    Normalized query embedding for the semantic verdict cache, or None if the
+    cache is disabled or the embedding is unavailable
+    
+    Uses the shared embeddings service, so the embedding is reused from
+    memory when the query goes on to a similarity search.
+    """
+    if not _semantic_cache_enabled():
+        return None
+    try:
+        return QueryCache.normalize(await get_embeddings_service().agenerate_embedding(query))
+    except Exception as e:
+        logger.warning(f"Guardrail cache lookup skipped: {e}")
+        return None
+
+
+def _template_key(query: str) -> str:
+    """Hash of the query with one ticket key and one number masked, case and whitespace folded"""
+    template = _NUMBER.sub("<n>", _TICKET_KEY.sub("<key>", query, count=1), count=1)
+    return hashlib.sha256(" ".join(template.lower().split()).encode("utf-8")).hexdigest()
+
+
+def _template_valid(key: str) -> bool:
+    """Whether a query with the same template was judged VALID within the cache TTL"""
+    inserted_at = _template_cache.get(key)
+    if inserted_at is None:
+        return False
+    if time.monotonic() - inserted_at > settings.guardrail_cache_ttl:
+        del _template_cache[key]
+        return False
+    _template_cache.move_to_end(key)
+    return True
+
+
+def _remember_valid(key: str) -> None:
+    if settings.guardrail_cache_size <= 0:
+        return
+    _template_cache[key] = time.monotonic()
+    _template_cache.move_to_end(key)
+    if len(_template_cache) > settings.guardrail_cache_size:
+        _template_cache.popitem(last=False)
+
+
+def _lookup(query_vec: Optional[np.ndarray]) -> Optional[str]:
+    """Cached VALID verdict for a near-identical earlier query"""
+    if query_vec is None:
+        return None
+    cached = _get_verdict_cache().get(query_vec, max_results=0)
+    if cached is None or not cached["verdict"].startswith("VALID"):
+        return None
+    return cached["verdict"]
+
+
 async def guardrail_node(state: AgentState, config: dict = None) -> AgentState:
     """
     Validate user request using guardrails and handle simple conversational queries
@@ -63,23 +197,18 @@ async def guardrail_node(state: AgentState, config: dict = None) -> AgentState:
         await event_queue.put({'event': 'guardrail', 'message': '🛡️ Validating request...'})
     
     query = state["user_query"]
-    query_lower = query.lower().strip()
     
-    # Handle simple greetings and conversational queries directly
-    greetings = ["hi", "hello", "hey", "good morning", "good afternoon", "good evening", "greetings"]
-    help_queries = ["help", "what can you do", "how can you help", "what do you do", "capabilities", "features"]
+    if _FAST_VALID.match(query):
+        state["is_valid_request"] = True
+        state["guardrail_message"] = None
+        logger.info("Guardrail: Request is valid (ticket creation follow-up)")
+        return state
     
-    # Check for simple greetings
-    if query_lower in greetings or any(query_lower.startswith(g) for g in greetings):
+    # Handle simple greetings and conversational queries directly
+    if _GREETING_RE.match(query):
         state["is_valid_request"] = False  # Will skip to end
         state["guardrail_message"] = "greeting_handled"
-        state["final_response"] = (
-            "Hello! 👋 I'm your Jira assistant. I can help you:\n\n"
-            "- 🔍 **Search** for existing tickets\n"
-            "- ➕ **Create** new tickets\n"
-            "- ✏️ **Update** existing tickets\n\n"
-            "What would you like to do today?"
-        )
+        state["final_response"] = GREETING_RESPONSE
         logger.info("Guardrail: Handled greeting directly")
         
         # Emit completion event
@@ -89,22 +218,10 @@ async def guardrail_node(state: AgentState, config: dict = None) -> AgentState:
         return state
     
     # Check for help/capability queries
-    if any(help_word in query_lower for help_word in help_queries):
+    if _HELP_RE.search(query):
         state["is_valid_request"] = False  # Will skip to end
         state["guardrail_message"] = "help_handled"
-        state["final_response"] = (
-            "I'm your Jira assistant! Here's what I can do:\n\n"
-            "🔍 **Search for tickets**\n"
-            "   - \"Find tickets about login issues\"\n"
-            "   - \"Show me all high priority bugs\"\n\n"
-            "➕ **Create new tickets**\n"
-            "   - \"Create a task for implementing dark mode\"\n"
-            "   - \"Create a bug for the payment gateway error\"\n\n"
-            "✏️ **Update existing tickets**\n"
-            "   - \"Update SCRUM-42 with a comment: completed\"\n"
-            "   - \"Add a comment to SCRUM-15\"\n\n"
-            "Just ask me naturally, and I'll help you manage your Jira tickets!"
-        )
+        state["final_response"] = HELP_RESPONSE
         logger.info("Guardrail: Handled help query directly")
         
         # Emit completion event
@@ -114,10 +231,31 @@ async def guardrail_node(state: AgentState, config: dict = None) -> AgentState:
         return state
     
     try:
-        # Check with LLM for other requests
-        chain = GUARDRAIL_PROMPT | llm
-        response = chain.invoke({"query": query})
-        result = response.content.strip()
+        # Reuse the verdict of a same-shape or near-identical earlier query, else ask
+        # the LLM. Only VALID verdicts are cached, so a blocked query is always re-judged.
+        template_key = _template_key(query)
+        if _template_valid(template_key):
+            result = "VALID"
+            logger.info("Guardrail: verdict served from template cache")
+        else:
+            # The LLM call starts right away; the (opt-in) semantic lookup runs
+            # alongside it and cancels it on a hit, so a miss adds no round-trip
+            llm_task = asyncio.create_task(
+                single_flight(_inflight, query, lambda: _get_chain().ainvoke({"query": query}))
+            )
+            try:
+                query_vec = await _embed(query)
+                result = _lookup(query_vec)
+                if result is not None:
+                    logger.info("Guardrail: verdict served from cache")
+                else:
+                    result = (await llm_task).content.strip()
+                    if query_vec is not None and result.startswith("VALID"):
+                        _get_verdict_cache().put(query_vec, 0, {"verdict": result})
+            finally:
+                llm_task.cancel()
+            if result.startswith("VALID"):
+                _remember_valid(template_key)
         
         if result.startswith("VALID"):
             state["is_valid_request"] = True
@@ -1,20 +1,21 @@
 """Jira agent for creating and updating tickets"""
 
-import sys
-import os
+import html
 import re
 from loguru import logger
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # optional; strip_html_tags falls back to regexes
+    HTMLParser = None
+
 from src.models import AgentState
+from jira_agents.services.jira_services import create_jira_ticket, update_jira_ticket_with_comment
 
-# Add jira-agents to path
-jira_agents_path = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-    'jira-agents'
-)
-sys.path.insert(0, jira_agents_path)
 
-from services.jira_services import create_jira_ticket, update_jira_ticket_with_comment
+# Compiled once; strip_html_tags runs on every ticket create
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
 
 
 def strip_html_tags(text: str) -> str:
@@ -30,23 +31,27 @@ def strip_html_tags(text: str) -> str:
     if not text:
         return text
     
-    logger.info(f"Stripping HTML from: {text[:100]}")
-    
-    # Remove HTML tags
-    clean = re.sub(r'<[^>]+>', '', text)
+    logger.debug("Stripping HTML from: {}", text[:100])
     
-    # Decode HTML entities
-    clean = clean.replace('&nbsp;', ' ')
-    clean = clean.replace('&lt;', '<')
-    clean = clean.replace('&gt;', '>')
-    clean = clean.replace('&amp;', '&')
-    clean = clean.replace('&quot;', '"')
+    if '<' not in text and '&' not in text:
+        # Plain text (the usual LLM-extracted field): only whitespace to collapse
+        clean = text
+    elif HTMLParser is not None:
+        # C parser (also handles '>' inside attribute values). Text nodes are
+        # joined as-is, like the regex path, and spacing is left to _WS_RE.
+        clean = HTMLParser(text).text(separator='', strip=False)
+    else:
+        # Remove tags, then decode entities (all of them, as the parser does)
+        clean = html.unescape(_TAG_RE.sub('', text))
     
-    # Remove extra whitespace and newlines
-    clean = re.sub(r'\s+', ' ', clean)
+    # Remove extra whitespace and newlines; single-spaced text (isprintable() is
+    # False for every whitespace character except ' ') only needs its ends trimmed
+    if clean.isprintable() and '  ' not in clean:
+        result = clean.strip()
+    else:
+        result = _WS_RE.sub(' ', clean).strip()
     
-    result = clean.strip()
-    logger.info(f"After stripping: {result[:100]}")
+    logger.debug("After stripping: {}", result[:100])
     
     return result
 
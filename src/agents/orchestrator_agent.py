@@ -1,21 +1,18 @@
 """Orchestrator agent for routing and intent classification"""
 
+import asyncio
+import hashlib
 import json
 import re
-from langchain_openai import ChatOpenAI
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 from langchain.prompts import ChatPromptTemplate
 from loguru import logger
 
 from src.models import AgentState
-from src.config import settings
-
-
-# Initialize LLM
-llm = ChatOpenAI(
-    model=settings.openai_model,
-    temperature=0,
-    openai_api_key=settings.openai_api_key
-)
+from src.services.clients import get_llm
+from src.utils.single_flight import single_flight
 
 
 ORCHESTRATOR_PROMPT = ChatPromptTemplate.from_messages([
@@ -76,6 +73,41 @@ FINAL REMINDER: Your response must contain ONLY plain text in the summary and de
 ])
 
 
+@lru_cache(maxsize=1)
+def _get_chain():
+    """Orchestrator chain, built on first use with the shared chat model"""
+    return ORCHESTRATOR_PROMPT | get_llm()
+
+
+# The classification is deterministic (temperature=0), so results are cached by
+# a hash of the normalized prompt input (query plus conversation context)
+INTENT_CACHE_SIZE = 4096
+_intent_cache: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+
+# Classifications in flight, so concurrent identical prompts share one LLM call
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _intent_cache_key(full_query: str) -> str:
+    return hashlib.sha256(" ".join(full_query.lower().split()).encode("utf-8")).hexdigest()
+
+
+def _cached_intent(key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    cached = _intent_cache.get(key)
+    if cached is None:
+        return None
+    _intent_cache.move_to_end(key)
+    intent, ticket_data = cached
+    return intent, dict(ticket_data)
+
+
+def _cache_intent(key: str, intent: str, ticket_data: Dict[str, Any]) -> None:
+    _intent_cache[key] = (intent, dict(ticket_data))
+    _intent_cache.move_to_end(key)
+    if len(_intent_cache) > INTENT_CACHE_SIZE:
+        _intent_cache.popitem(last=False)
+
+
 async def orchestrator_node(state: AgentState, config: dict = None) -> AgentState:
     """
     Classify user intent and extract ticket data with conversation context
@@ -111,27 +143,36 @@ async def orchestrator_node(state: AgentState, config: dict = None) -> AgentStat
         # Combine context with query
         full_query = "\n".join(context_parts) + f"\n{query}" if context_parts else query
         
-        chain = ORCHESTRATOR_PROMPT | llm
-        response = chain.invoke({"query": full_query})
-        
-        # Parse JSON response
-        content = response.content.strip()
-        
-        # Try to extract JSON from response
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            data = json.loads(json_match.group())
-            intent = data.get("intent", "search").lower()
-            ticket_data = data.get("ticket_data", {})
+        cache_key = _intent_cache_key(full_query)
+        cached = _cached_intent(cache_key)
+        if cached is not None:
+            intent, ticket_data = cached
+            logger.info("Orchestrator: classification served from cache")
         else:
-            # Fallback: treat response as just intent
-            intent = content.lower()
-            ticket_data = {}
-        
-        # Validate intent
-        if intent not in ["search", "create", "update", "info"]:
-            logger.warning(f"Invalid intent '{intent}', defaulting to 'search'")
-            intent = "search"
+            response = await single_flight(
+                _inflight, cache_key, lambda: _get_chain().ainvoke({"query": full_query})
+            )
+            
+            # Parse JSON response
+            content = response.content.strip()
+            
+            # Try to extract JSON from response
+            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            if json_match:
+                data = json.loads(json_match.group())
+                intent = data.get("intent", "search").lower()
+                ticket_data = data.get("ticket_data", {})
+            else:
+                # Fallback: treat response as just intent
+                intent = content.lower()
+                ticket_data = {}
+            
+            # Validate intent (only well-formed classifications are cached)
+            if intent not in ["search", "create", "update", "info"]:
+                logger.warning(f"Invalid intent '{intent}', defaulting to 'search'")
+                intent = "search"
+            else:
+                _cache_intent(cache_key, intent, ticket_data)
         
         # Log extracted data for debugging
         logger.info(f"Orchestrator: Classified as '{intent}'")
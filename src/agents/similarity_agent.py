@@ -1,19 +1,9 @@
 """Similarity agent for searching similar tickets"""
 
-import sys
-import os
 from loguru import logger
 
 from src.models import AgentState
 from src.config import settings
-
-# Add similarity_agent to path
-similarity_agent_path = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-    'similarity_agent'
-)
-sys.path.insert(0, similarity_agent_path)
-
 from similarity_agent import SimilarityAgent
 
 
@@ -53,7 +43,7 @@ async def similarity_node(state: AgentState, config: dict = None) -> AgentState:
     try:
         # Use the similarity agent to search
         agent = get_similarity_agent()
-        result = agent.search(query=query, max_results=max_results)
+        result = await agent.asearch(query=query, max_results=max_results)
         
         # Map the similarity agent response to our state format
         matched_tickets = result.get("matched_tickets", [])
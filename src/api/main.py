@@ -34,6 +34,14 @@ async def lifespan(app: FastAPI):
     sync_job = TicketSyncJob()
     sync_job.start()
     
+    # Warm up the similarity agent so the first search request doesn't pay
+    # for building its graph and services
+    try:
+        from src.agents.similarity_agent import get_similarity_agent
+        get_similarity_agent()
+    except Exception as e:
+        logger.warning(f"Similarity agent warmup failed: {e}")
+    
     logger.info("Jira Assistant API started successfully")
     
     yield
@@ -44,6 +52,13 @@ async def lifespan(app: FastAPI):
     if sync_job:
         sync_job.stop()
     
+    # Close the pooled Jira/notification HTTP clients used by the Jira agent
+    try:
+        from jira_agents.services import jira_services
+        await jira_services.aclose()
+    except Exception as e:
+        logger.warning(f"Failed to close Jira HTTP clients: {e}")
+    
     logger.info("Jira Assistant API shutdown complete")
 
 
@@ -97,6 +97,26 @@ class Settings(BaseSettings):
         # Remove trailing slash if present
         return v.strip().rstrip('/')
     
+    @field_validator('faiss_index_type')
+    @classmethod
+    def validate_faiss_index_type(cls, v: str) -> str:
+        """Validate FAISS index type"""
+        v = v.strip().lower()
+        allowed = ("flat", "binary", "ivfpq", "hnsw", "hnsw_sq8", "fp16", "sq8")
+        if v not in allowed:
+            raise ValueError(f"FAISS_INDEX_TYPE must be one of: {', '.join(allowed)}")
+        return v
+    
+    @field_validator('env')
+    @classmethod
+    def validate_env(cls, v: str) -> str:
+        """Validate runtime environment"""
+        v = v.strip().lower()
+        allowed = ("development", "production")
+        if v not in allowed:
+            raise ValueError(f"ENV must be one of: {', '.join(allowed)}")
+        return v
+    
     @field_validator('jira_project_key')
     @classmethod
     def validate_project_key(cls, v: str) -> str:
@@ -114,6 +134,51 @@ class Settings(BaseSettings):
         default="jira_tickets",
         description="Name of FAISS index file"
     )
+    faiss_index_type: str = Field(
+        default="flat",
+        description=(
+            "FAISS index type: 'flat' (exact fp32 L2), 'binary' (sign-bit quantized, Hamming search + fp32 rerank) "
+            "'ivfpq' (inverted lists + product quantization, ADC search + fp32 rerank), "
+            "'hnsw' (HNSW graph over fp32 vectors), 'hnsw_sq8' (HNSW graph over 8-bit scalar-quantized vectors + fp32 rerank), "
+            "'fp16' (exact search over half-precision vectors) or 'sq8' (exact search over 8-bit scalar-quantized vectors + fp32 rerank)"
+        )
+    )
+    ivf_nlist: int = Field(
+        default=1024,
+        description="Maximum number of IVF coarse clusters (reduced automatically for small stores)",
+        ge=1
+    )
+    ivf_nprobe: int = Field(
+        default=16,
+        description="Number of IVF clusters visited per query (higher = better recall, slower)",
+        ge=1
+    )
+    pq_m: int = Field(
+        default=32,
+        description="Number of PQ sub-quantizers (bytes per encoded vector); must divide the embedding dimension",
+        ge=1
+    )
+    hnsw_m: int = Field(
+        default=32,
+        description="HNSW graph degree (neighbors per node)",
+        ge=4
+    )
+    hnsw_ef_construction: int = Field(
+        default=200,
+        description="HNSW candidate list size while building the graph",
+        ge=1
+    )
+    hnsw_ef_search: int = Field(
+        default=64,
+        description="HNSW candidate list size per query (higher = better recall, slower)",
+        ge=1
+    )
+    rerank_factor: int = Field(
+        default=4,
+        description="Candidates fetched per requested result from approximate indexes before exact fp32 rerank",
+        ge=1,
+        le=50
+    )
     
     # Sync Job Configuration
     sync_interval_hours: int = Field(
@@ -141,6 +206,10 @@ class Settings(BaseSettings):
         default="INFO",
         description="Logging level (DEBUG, INFO, WARNING, ERROR)"
     )
+    env: str = Field(
+        default="production",
+        description="Runtime environment: 'development' enables uvicorn auto-reload"
+    )
     
     # Agent Configuration
     max_similarity_results: int = Field(
@@ -162,6 +231,59 @@ class Settings(BaseSettings):
         le=10
     )
     
+    # Similarity agent: skip the result-analysis LLM call when the top score is decisive
+    llm_skip_high_tau: float = Field(
+        default=0.9,
+        description="Top similarity score at or above which results are reported as a high-confidence match without an LLM call",
+        ge=0.0,
+        le=1.0
+    )
+    llm_skip_low_tau: float = Field(
+        default=0.5,
+        description="Top similarity score below which results are reported as low confidence without an LLM call",
+        ge=0.0,
+        le=1.0
+    )
+    
+    # Similarity agent semantic query cache
+    query_cache_size: int = Field(
+        default=2000,
+        description="Max cached similarity search results (0 disables the query cache)",
+        ge=0
+    )
+    query_cache_ttl: float = Field(
+        default=300.0,
+        description="Seconds a cached similarity search result stays valid",
+        ge=0.0
+    )
+    query_cache_threshold: float = Field(
+        default=0.95,
+        description="Cosine similarity between queries required to reuse a cached result",
+        ge=0.0,
+        le=1.0
+    )
+    
+    # Guardrail verdict cache
+    guardrail_cache_size: int = Field(
+        default=1000,
+        description="Max cached guardrail verdicts (0 disables the guardrail cache)",
+        ge=0
+    )
+    guardrail_cache_ttl: float = Field(
+        default=86400.0,
+        description="Seconds a cached guardrail verdict stays valid",
+        ge=0.0
+    )
+    guardrail_cache_threshold: float = Field(
+        default=1.0,
+        description=(
+            "Cosine similarity between query embeddings required to reuse a VALID guardrail verdict; "
+            "1.0 disables this semantic lookup, so verdicts are only reused for the same normalized text"
+        ),
+        ge=0.0,
+        le=1.0
+    )
+    
     # LangSmith Configuration (Optional - for tracing/debugging)
     langchain_tracing_v2: bool = Field(
         default=False,
@@ -16,6 +16,57 @@ from src.agents import orchestrator_node, guardrail_node, similarity_node, jira_
 memory = MemorySaver()
 
 
+async def preroute_node(state: AgentState, config: dict = None) -> AgentState:
+    """
+    Run the guardrail and intent classification concurrently
+    
+    Both only read the query and conversation history, so the orchestrator's
+    LLM call overlaps the guardrail's instead of following it. When the
+    guardrail stops the request (greeting, help or blocked), the orchestrator
+    is cancelled and its result dropped.
+    
+    The orchestrator runs without the event queue; its progress events are
+    emitted here once the guardrail has let the request through, so streamed
+    events keep their sequential order and a blocked request never reports
+    an intent.
+    
+    Args:
+        state: Current agent state
+        config: LangGraph config containing runtime context
+    
+    Returns:
+        Guardrail results, plus intent and ticket data for valid requests
+    """
+    configurable = (config or {}).get("configurable", {})
+    event_queue = configurable.get("event_queue")
+    quiet_config = {
+        **(config or {}),
+        "configurable": {k: v for k, v in configurable.items() if k != "event_queue"}
+    }
+    
+    orchestrator_task = asyncio.create_task(orchestrator_node(dict(state), quiet_config))
+    try:
+        state = await guardrail_node(dict(state), config)
+        if should_continue_after_guardrail(state) == "end":
+            orchestrator_task.cancel()
+            return state
+        
+        if event_queue:
+            await event_queue.put({'event': 'orchestrator', 'message': '🧠 Analyzing intent...'})
+        classified = await orchestrator_task
+    finally:
+        orchestrator_task.cancel()
+    
+    state["intent"] = classified["intent"]
+    state["ticket_data"] = classified["ticket_data"]
+    
+    if event_queue:
+        await event_queue.put({
+            'event': 'thinking_complete', 'message': '💡 Analysis complete', 'intent': state["intent"]
+        })
+    return state
+
+
 async def create_final_response_node(state: AgentState, config: dict = None) -> AgentState:
     """
     Create final response for search or info intents
@@ -120,6 +171,19 @@ def should_check_similarity(state: AgentState) -> Literal["similarity", "jira",
         return "final"
 
 
+def route_after_preroute(state: AgentState) -> Literal["similarity", "jira", "final", "end"]:
+    """
+    Route after the combined guardrail + intent classification step
+    
+    Args:
+        state: Current agent state
+    
+    Returns:
+        Next node to execute
+    """
+    if should_continue_after_guardrail(state) == "end":
+        return "end"
+    return should_check_similarity(state)
 
 
 def create_jira_graph() -> StateGraph:
@@ -132,29 +196,19 @@ def create_jira_graph() -> StateGraph:
     # Create graph
     workflow = StateGraph(AgentState)
     
-    # Add nodes
-    workflow.add_node("guardrail", guardrail_node)
-    workflow.add_node("orchestrator", orchestrator_node)
+    # Add nodes (guardrail and orchestrator run together in preroute)
+    workflow.add_node("preroute", preroute_node)
     workflow.add_node("similarity", similarity_node)
     workflow.add_node("jira", jira_node)
     workflow.add_node("final", create_final_response_node)
     
     # Set entry point
-    workflow.set_entry_point("guardrail")
+    workflow.set_entry_point("preroute")
     
     # Add edges
     workflow.add_conditional_edges(
-        "guardrail",
-        should_continue_after_guardrail,
-        {
-            "orchestrator": "orchestrator",
-            "end": END
-        }
-    )
-    
-    workflow.add_conditional_edges(
-        "orchestrator",
-        should_check_similarity,
+        "preroute",
+        route_after_preroute,
         {
             "similarity": "similarity",
             "jira": "jira",
@@ -5,6 +5,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
 
 from src.services import JiraService, VectorStore, EmbeddingsService
+from src.services.clients import reload_vector_store
 from src.config import settings
 
 
@@ -57,6 +58,8 @@ class TicketSyncJob:
             # Rebuild vector store (simple 1:1 mapping - one ticket = one embedding)
             logger.info("Updating vector store...")
             self.vector_store.rebuild(tickets, embeddings)
+            # Serve searches from the rebuilt files
+            reload_vector_store()
             
             logger.info(
                 f"✅ Ticket sync completed successfully! "
@@ -3,6 +3,7 @@
 from .jira_service import JiraService
 from .vector_store import VectorStore
 from .embeddings_service import EmbeddingsService
+from .query_cache import QueryCache
 
-__all__ = ["JiraService", "VectorStore", "EmbeddingsService"]
+__all__ = ["JiraService", "VectorStore", "EmbeddingsService", "QueryCache"]
 
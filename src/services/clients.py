@@ -0,0 +1,77 @@
+"""Shared, lazily created service clients
+
+One chat model, embeddings service and vector store per process, used by the
+main app's agents and by the similarity agent. Each is created (and its heavy
+modules imported) on first use, so importing a caller - e.g. for a health
+check - doesn't load the vector store or build OpenAI clients.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+import httpx
+
+from src.config.settings import settings
+
+
+@lru_cache(maxsize=1)
+def _get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    One keep-alive HTTP/2 pool per sync/async path, shared by the chat model and
+    the embeddings client so every OpenAI call reuses warm connections
+    
+    The AsyncClient is bound to the event loop that first uses it: async callers
+    must all share one loop (synchronous wrappers go through the similarity
+    agent's persistent loop, never asyncio.run).
+    """
+    limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    return (
+        httpx.Client(http2=True, limits=limits, timeout=30),
+        httpx.AsyncClient(http2=True, limits=limits, timeout=30)
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """Get the shared chat model"""
+    from langchain_openai import ChatOpenAI
+    
+    http_client, http_async_client = _get_http_clients()
+    return ChatOpenAI(
+        model=settings.openai_model,
+        temperature=0,
+        openai_api_key=settings.openai_api_key,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
+@lru_cache(maxsize=1)
+def get_vector_store():
+    """Get the shared vector store (loaded from disk on first call)"""
+    from src.services.vector_store import VectorStore
+    
+    return VectorStore()
+
+
+def reload_vector_store() -> None:
+    """
+    Drop the shared vector store so the next get_vector_store() loads the files
+    on disk again (call after a sync rebuilds them)
+    
+    Searches already holding the old instance finish on it; save() replaces the
+    files rather than rewriting them, so its memory-mapped vectors stay valid.
+    """
+    get_vector_store.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_embeddings_service():
+    """Get the shared embeddings service"""
+    from src.services.embeddings_service import EmbeddingsService
+    
+    http_client, http_async_client = _get_http_clients()
+    return EmbeddingsService(
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
@@ -1,19 +1,74 @@
 """Embeddings service for generating vector representations using OpenAI"""
 
-from typing import List
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
 from langchain_openai import OpenAIEmbeddings
 from loguru import logger
 
 from src.config import settings
 
 
+# Query embeddings are cached in memory (LRU) and on disk (SQLite), keyed by
+# model + SHA-256 of the whitespace-normalized text, so repeated queries skip
+# the OpenAI round trip
+EMBEDDING_MEMORY_CACHE_SIZE = 4096
+EMBEDDING_DISK_CACHE_FILE = "embedding_cache.sqlite"
+
+
+class EmbeddingDiskCache:
+    """SQLite store of zlib-compressed float32 embeddings keyed by (model, text hash)"""
+    
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT, hash TEXT, vec BLOB, ts INTEGER, PRIMARY KEY (model, hash))"
+        )
+        self._conn.commit()
+    
+    def get(self, model: str, text_hash: str) -> Optional[Tuple[float, ...]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vec FROM embeddings WHERE model = ? AND hash = ?", (model, text_hash)
+            ).fetchone()
+        if row is None:
+            return None
+        return tuple(np.frombuffer(zlib.decompress(row[0]), dtype=np.float32).tolist())
+    
+    def put(self, model: str, text_hash: str, embedding: List[float]) -> None:
+        blob = zlib.compress(np.asarray(embedding, dtype=np.float32).tobytes())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vec, ts) VALUES (?, ?, ?, ?)",
+                (model, text_hash, blob, int(time.time()))
+            )
+            self._conn.commit()
+
+
 class EmbeddingsService:
     """Service for generating embeddings from text using OpenAI"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[httpx.Client] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None
+    ):
         """
         Initialize OpenAI embedding model
         
+        Args:
+            http_client: Shared httpx client for sync OpenAI calls (optional)
+            http_async_client: Shared httpx client for async OpenAI calls (optional)
+        
         Note: Chunking is NOT used for Jira tickets because:
         - Tickets are naturally small (200-3000 characters typical)
         - Well below OpenAI limit (8191 tokens = ~32,000 characters)
@@ -24,20 +79,81 @@ class EmbeddingsService:
         # Using text-embedding-3-small (1536 dimensions, cost-effective)
         self.embeddings = OpenAIEmbeddings(
             model="text-embedding-3-small",
-            openai_api_key=settings.openai_api_key
+            openai_api_key=settings.openai_api_key,
+            http_client=http_client,
+            http_async_client=http_async_client
         )
         
         self.embedding_dimension = 1536  # Dimension for text-embedding-3-small
         
+        # Disk tier is best-effort: a read-only or missing data dir just disables it
+        self._disk_cache: Optional[EmbeddingDiskCache] = None
+        try:
+            self._disk_cache = EmbeddingDiskCache(settings.vector_store_path / EMBEDDING_DISK_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Embedding disk cache disabled: {e}")
+        # In-memory LRU shared by the sync and async paths
+        self._memory_cache: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        
         logger.info(
             f"Embeddings service initialized with OpenAI text-embedding-3-small "
             f"(dim={self.embedding_dimension}, no chunking - tickets are small enough)"
         )
     
+    def _cache_get(self, text: str) -> Optional[Tuple[float, ...]]:
+        """Look a text up in the in-memory LRU, then the disk cache"""
+        key = self._cache_key(text)
+        with self._memory_lock:
+            cached = self._memory_cache.get(key)
+            if cached is not None:
+                self._memory_cache.move_to_end(key)
+                return cached
+        
+        if self._disk_cache is not None:
+            try:
+                cached = self._disk_cache.get(self.embeddings.model, self._text_hash(key))
+            except Exception as e:
+                logger.warning(f"Embedding disk cache read failed: {e}")
+            if cached is not None:
+                self._remember(key, cached)
+        return cached
+    
+    def _cache_put(self, text: str, embedding: List[float]) -> Tuple[float, ...]:
+        """Store a freshly generated embedding in both cache tiers"""
+        key = self._cache_key(text)
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.put(self.embeddings.model, self._text_hash(key), embedding)
+            except Exception as e:
+                logger.warning(f"Embedding disk cache write failed: {e}")
+        embedding = tuple(embedding)
+        self._remember(key, embedding)
+        return embedding
+    
+    def _remember(self, key: str, embedding: Tuple[float, ...]) -> None:
+        with self._memory_lock:
+            self._memory_cache[key] = embedding
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > EMBEDDING_MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Texts differing only in surrounding/repeated whitespace share a cache entry"""
+        return " ".join(text.split())
+    
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text using OpenAI
         
+        Repeated texts are served from an in-memory LRU cache and then from the
+        SQLite cache in the vector store directory, without calling OpenAI.
+        
         Args:
             text: Input text
         
@@ -45,12 +161,94 @@ class EmbeddingsService:
             List of floats representing the embedding
         """
         try:
-            embedding = self.embeddings.embed_query(text)
-            return embedding
+            cached = self._cache_get(text)
+            if cached is not None:
+                return list(cached)
+            return list(self._cache_put(text, self.embeddings.embed_query(text)))
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             raise
     
+    async def agenerate_embedding(self, text: str) -> List[float]:
+        """
+        Async version of generate_embedding (same caches, non-blocking OpenAI call)
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            List of floats representing the embedding
+        """
+        try:
+            cached = self._cache_get(text)
+            if cached is not None:
+                return list(cached)
+            return list(self._cache_put(text, await self.embeddings.aembed_query(text)))
+        except Exception as e:
+            logger.error(f"Error generating embedding: {e}")
+            raise
+    
+    def _split_cached(self, texts: List[str]) -> Tuple[Dict[str, Tuple[float, ...]], List[str]]:
+        """Dedup texts and split them into cached embeddings and texts still to embed"""
+        found: Dict[str, Tuple[float, ...]] = {}
+        missing: List[str] = []
+        for text in dict.fromkeys(texts):
+            cached = self._cache_get(text)
+            if cached is not None:
+                found[text] = cached
+            else:
+                missing.append(text)
+        return found, missing
+    
+    def _stack(self, texts: List[str], found: Dict[str, Tuple[float, ...]]) -> np.ndarray:
+        """One float32 row per input text (duplicates share an embedding)"""
+        return np.asarray(
+            [found[text] for text in texts], dtype=np.float32
+        ).reshape(len(texts), self.embedding_dimension)
+    
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate query embeddings for many texts with at most one OpenAI request
+        
+        Duplicate texts are embedded once, and texts already in the embedding
+        caches are not sent at all; new embeddings are added to the caches.
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            float32 array of shape (len(texts), embedding_dimension), one row per text
+        """
+        try:
+            found, missing = self._split_cached(texts)
+            if missing:
+                for text, embedding in zip(missing, self.embeddings.embed_documents(missing)):
+                    found[text] = self._cache_put(text, embedding)
+            return self._stack(texts, found)
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+    
+    async def agenerate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Async version of generate_embeddings
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            float32 array of shape (len(texts), embedding_dimension), one row per text
+        """
+        try:
+            found, missing = self._split_cached(texts)
+            if missing:
+                for text, embedding in zip(missing, await self.embeddings.aembed_documents(missing)):
+                    found[text] = self._cache_put(text, embedding)
+            return self._stack(texts, found)
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+    
     def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts using OpenAI batch API
@@ -0,0 +1,224 @@
+"""Semantic query-result cache (similarity agent results, guardrail verdicts)
+
+Near-duplicate queries ("Login page shows 401" / "User login 401 error") embed
+to nearly identical vectors. Caching finished search results keyed on the
+query embedding lets such queries skip both LLM calls and the vector search.
+
+Entries can also be persisted to SQLite so a restarted process starts warm.
+"""
+
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+from loguru import logger
+
+# Default file name for the persisted cache (in the vector store directory)
+QUERY_CACHE_FILE = "query_cache.sqlite"
+
+
+class QueryCache:
+    """
+    LRU + TTL cache of search results keyed on normalized query embeddings.
+
+    A lookup is a hit when a cached query's cosine similarity with the new
+    query is at least `threshold`, the entry is younger than `ttl` seconds and
+    it was produced for the same `max_results`.
+
+    Entries live in preallocated parallel arrays, so a lookup is a single
+    matrix-vector product over at most `max_size` rows.
+    
+    With a `path`, every put is also written to a SQLite table (in WAL mode)
+    and unexpired entries are loaded back on construction. Writes are handed to
+    a background thread, so put never waits on disk or on another process
+    holding the database lock. Persistence is best-effort: a SQLite error at
+    startup disables it, failed writes are logged and dropped, and writes still
+    queued at interpreter exit are lost.
+
+    Example:
+        >>> cache = QueryCache(max_size=2000, ttl=300, threshold=0.95)
+        >>> vec = QueryCache.normalize(embedding)
+        >>> result = cache.get(vec, max_results=5)
+        >>> if result is None:
+        ...     result = run_search()
+        ...     cache.put(vec, 5, result)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2000,
+        ttl: float = 300.0,
+        threshold: float = 0.95,
+        path=None
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self._lock = threading.RLock()
+        self._size = 0
+        self._matrix: Optional[np.ndarray] = None  # (max_size, dim) float32, allocated on first put
+        self._inserted_at = np.zeros(max_size, dtype=np.float64)
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._max_results = np.zeros(max_size, dtype=np.int32)
+        self._results: List[Optional[Dict[str, Any]]] = [None] * max_size
+        
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes: Optional[queue.SimpleQueue] = None
+        if path is not None and max_size > 0:
+            try:
+                self._conn = sqlite3.connect(str(path), check_same_thread=False)
+                # WAL lets readers and the writer (and other worker processes) proceed concurrently
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS qcache ("
+                    "qhash TEXT, max_results INTEGER, vec BLOB, payload BLOB, ts REAL, "
+                    "PRIMARY KEY (qhash, max_results))"
+                )
+                self._conn.commit()
+                self._load()
+            except Exception as e:
+                logger.warning(f"Query cache persistence disabled: {e}")
+                self._conn = None
+            else:
+                self._writes = queue.SimpleQueue()
+                threading.Thread(target=self._writer, name="query-cache-writer", daemon=True).start()
+    
+    def _load(self) -> None:
+        """Drop expired rows from disk and load the newest live ones into memory."""
+        wall_now = time.time()
+        self._conn.execute("DELETE FROM qcache WHERE ts < ?", (wall_now - self.ttl,))
+        self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT vec, max_results, payload, ts FROM qcache ORDER BY ts DESC LIMIT ?",
+            (self.max_size,)
+        ).fetchall()
+        
+        # Map wall-clock insert times onto the monotonic clock used in memory
+        offset = time.monotonic() - wall_now
+        for row, (vec, max_results, payload, ts) in enumerate(rows):
+            vec = np.frombuffer(vec, dtype=np.float32)
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_size, vec.shape[0]), dtype=np.float32)
+            self._matrix[row] = vec
+            self._inserted_at[row] = ts + offset
+            self._last_used[row] = ts + offset
+            self._max_results[row] = max_results
+            self._results[row] = orjson.loads(payload)
+        self._size = len(rows)
+        if rows:
+            logger.info(f"Loaded {len(rows)} cached query results from disk")
+    
+    def _writer(self) -> None:
+        """Apply queued disk writes, committing once per drained batch."""
+        while True:
+            ops = [self._writes.get()]
+            while True:
+                try:
+                    ops.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                for op in ops:
+                    if op is None:
+                        self._conn.execute("DELETE FROM qcache")
+                    else:
+                        vec, max_results, result, ts = op
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO qcache (qhash, max_results, vec, payload, ts) VALUES (?, ?, ?, ?, ?)",
+                            (hashlib.sha256(vec).hexdigest(), max_results, vec, orjson.dumps(result), ts)
+                        )
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"Query cache disk write failed: {e}")
+                try:
+                    self._conn.rollback()
+                except Exception:
+                    pass
+    
+    def _persist(self, query_vec: np.ndarray, max_results: int, result: Dict[str, Any]) -> None:
+        """Queue an entry for the background writer."""
+        vec = np.ascontiguousarray(query_vec, dtype=np.float32).tobytes()
+        self._writes.put((vec, max_results, result, time.time()))
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        """Return the embedding as a unit-length float32 vector."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _best_match(self, query_vec: np.ndarray, max_results: int, now: float) -> Optional[int]:
+        """Row of the most similar live entry for max_results, if it clears the threshold."""
+        n = self._size
+        if n == 0:
+            return None
+        scores = self._matrix[:n] @ query_vec
+        valid = (self._max_results[:n] == max_results) & (self._inserted_at[:n] >= now - self.ttl)
+        scores = np.where(valid, scores, -np.inf)
+        row = int(np.argmax(scores))
+        return row if scores[row] >= self.threshold else None
+
+    def get(self, query_vec: np.ndarray, max_results: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result for a normalized query vector.
+
+        Returns:
+            A shallow copy of the cached result dict, or None on a miss
+        """
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            row = self._best_match(query_vec, max_results, now)
+            if row is None:
+                return None
+            self._last_used[row] = now
+            return dict(self._results[row])
+
+    def put(self, query_vec: np.ndarray, max_results: int, result: Dict[str, Any]) -> None:
+        """
+        Cache a result for a normalized query vector.
+
+        A near-identical live entry is overwritten; otherwise the result takes a
+        free row, or the least recently used row once the cache is full.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_size, query_vec.shape[0]), dtype=np.float32)
+
+            row = self._best_match(query_vec, max_results, now)
+            if row is None:
+                if self._size < self.max_size:
+                    row = self._size
+                    self._size += 1
+                else:
+                    row = int(np.argmin(self._last_used))
+
+            self._matrix[row] = query_vec
+            self._inserted_at[row] = now
+            self._last_used[row] = now
+            self._max_results[row] = max_results
+            self._results[row] = dict(result)
+            
+            if self._writes is not None:
+                self._persist(query_vec, max_results, self._results[row])
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._size = 0
+            self._results = [None] * self.max_size
+            if self._writes is not None:
+                self._writes.put(None)
+
+    def __len__(self) -> int:
+        return self._size
@@ -1,16 +1,85 @@
 """Vector store service using FAISS"""
 
+import mmap
+import os
 import pickle
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 import numpy as np
 import faiss
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from loguru import logger
 
 from src.config import settings
 from src.models import JiraTicket
 
 
+def _replace_atomically(path: Path, write) -> None:
+    """
+    Write a file via write(tmp_path) beside path, then rename it over path
+    
+    Readers that still have the old file open or memory-mapped (e.g. the serving
+    store's vectors) keep seeing the old contents instead of a half-written or
+    truncated file.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    with open(path, 'wb') as f:
+        np.save(f, array)
+
+
+def _save_pickle(path: Path, obj: Any) -> None:
+    with open(path, 'wb') as f:
+        pickle.dump(obj, f, protocol=5)
+
+
+# Columnar copy of the metadata used by inspection tooling (inspect_vector_db.py).
+# Low-cardinality columns are dictionary-encoded so histograms run over int32 codes.
+METADATA_SCHEMA = pa.schema([
+    ("key", pa.string()),
+    ("status", pa.string()),
+    ("priority", pa.string()),
+    ("issue_type", pa.string()),
+    ("summary", pa.string()),
+    ("description", pa.string()),
+    ("created", pa.string()),
+])
+DICTIONARY_COLUMNS = ["status", "priority", "issue_type"]
+# Lowercased copies computed once at sync time so keyword scans skip per-query case folding
+LOWERCASE_COLUMNS = {"summary_lc": "summary", "description_lc": "description"}
+
+# On-disk index file suffix per FAISS_INDEX_TYPE
+INDEX_SUFFIXES = {
+    "flat": ".index",
+    "binary": ".bin.index",
+    "ivfpq": ".ivfpq.index",
+    "hnsw": ".hnsw.index",
+    "hnsw_sq8": ".hnsw_sq8.index",
+    "fp16": ".fp16.index",
+    "sq8": ".sq8.index",
+}
+
+# Scalar quantizer codes for the quantized flat index types
+SCALAR_QUANTIZERS = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "sq8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+# Index types whose stored vectors are compressed, so results are re-scored
+# exactly against the fp32 originals
+RERANKED_INDEX_TYPES = ("binary", "ivfpq", "hnsw_sq8", "sq8")
+
+# PQ codebooks use 8 bits (256 centroids) per sub-quantizer, so training needs
+# at least this many vectors; smaller stores are indexed exactly instead
+MIN_PQ_TRAINING_VECTORS = 256
+
+
 class VectorStore:
     """FAISS-based vector store for similarity search"""
     
@@ -24,10 +93,14 @@ class VectorStore:
         Note: Each ticket gets exactly one embedding. No chunking is used because
         Jira tickets are naturally small and focused (200-3000 chars typical).
         """
-        self.index_path = settings.vector_store_path / f"{settings.faiss_index_name}.index"
+        self.index_type = settings.faiss_index_type
+        self.index_path = settings.vector_store_path / f"{settings.faiss_index_name}{INDEX_SUFFIXES[self.index_type]}"
+        self.vectors_path = settings.vector_store_path / f"{settings.faiss_index_name}_vectors.npy"
         self.metadata_path = settings.vector_store_path / f"{settings.faiss_index_name}_metadata.pkl"
+        self.metadata_parquet_path = settings.vector_store_path / f"{settings.faiss_index_name}_metadata.parquet"
         self.index = None
         self.metadata: List[Dict[str, Any]] = []
+        self.vectors: Optional[np.ndarray] = None  # fp32 originals, used to rerank approximate indexes
         self.dimension = dimension  # 1536 for OpenAI text-embedding-3-small, 3072 for large
         
         # Load existing index if available
@@ -38,8 +111,65 @@ class VectorStore:
     
     def _initialize_index(self):
         """Initialize a new FAISS index"""
-        self.index = faiss.IndexFlatL2(self.dimension)
-        logger.info(f"Initialized new FAISS index with dimension {self.dimension}")
+        if self.index_type == "binary":
+            # One bit per dimension (sign of each component), compared by Hamming distance
+            self.index = faiss.IndexBinaryFlat(self.dimension)
+        elif self.index_type == "ivfpq":
+            # Untrained until the first add_tickets(), which sizes it to the data
+            self.index = faiss.index_factory(self.dimension, f"IVF{settings.ivf_nlist},PQ{settings.pq_m}")
+        elif self.index_type in ("hnsw", "hnsw_sq8"):
+            if self.index_type == "hnsw_sq8":
+                self.index = faiss.IndexHNSWSQ(self.dimension, faiss.ScalarQuantizer.QT_8bit, settings.hnsw_m)
+            else:
+                self.index = faiss.IndexHNSWFlat(self.dimension, settings.hnsw_m)
+            self.index.hnsw.efConstruction = settings.hnsw_ef_construction
+            self.index.hnsw.efSearch = settings.hnsw_ef_search
+        elif self.index_type in SCALAR_QUANTIZERS:
+            self.index = faiss.IndexScalarQuantizer(
+                self.dimension, SCALAR_QUANTIZERS[self.index_type], faiss.METRIC_L2
+            )
+        else:
+            self.index = faiss.IndexFlatL2(self.dimension)
+        self.vectors = None
+        logger.info(f"Initialized new FAISS {self.index_type} index with dimension {self.dimension}")
+    
+    def _train_ivfpq_index(self, embeddings_array: np.ndarray):
+        """
+        Build and train an IVF-PQ index sized for the given training vectors
+        
+        Args:
+            embeddings_array: fp32 training vectors (all tickets at sync time)
+        
+        Returns:
+            Trained FAISS index (exact IndexFlatL2 if there are too few vectors to train PQ)
+        """
+        n = len(embeddings_array)
+        if n < MIN_PQ_TRAINING_VECTORS:
+            logger.warning(
+                f"Only {n} vectors, too few to train IVF-PQ (need {MIN_PQ_TRAINING_VECTORS}); "
+                f"using exact flat index"
+            )
+            return faiss.IndexFlatL2(self.dimension)
+        
+        # ~39 training points per cluster is the FAISS minimum for stable k-means
+        nlist = max(1, min(settings.ivf_nlist, n // 39))
+        index = faiss.index_factory(self.dimension, f"IVF{nlist},PQ{settings.pq_m}")
+        index.train(embeddings_array)
+        self._set_search_params(index)
+        logger.info(f"Trained IVF-PQ index (nlist={nlist}, M={settings.pq_m}) on {n} vectors")
+        return index
+    
+    def _set_search_params(self, index):
+        """Apply the configured query-time parameters (nprobe / efSearch)"""
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = min(settings.ivf_nprobe, index.nlist)
+        elif isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efSearch = settings.hnsw_ef_search
+    
+    @property
+    def needs_rerank(self) -> bool:
+        """Whether search results come from an approximate index and need exact rerank"""
+        return self.index_type in RERANKED_INDEX_TYPES
     
     def add_tickets(self, tickets: List[JiraTicket], embeddings: List[List[float]]):
         """
@@ -55,8 +185,25 @@ class VectorStore:
         # Convert embeddings to numpy array
         embeddings_array = np.array(embeddings, dtype=np.float32)
         
+        # Train quantized indexes on the first batch (sync rebuilds the store from scratch)
+        if self.index_type == "ivfpq" and not self.index.is_trained:
+            self.index = self._train_ivfpq_index(embeddings_array)
+        elif not self.index.is_trained:
+            # Scalar quantizers learn per-dimension ranges from the data
+            self.index.train(embeddings_array)
+        
         # Add to FAISS index
-        self.index.add(embeddings_array)
+        if self.index_type == "binary":
+            self.index.add(np.packbits(embeddings_array > 0, axis=1))
+        else:
+            self.index.add(embeddings_array)
+        
+        # Keep fp32 originals for exact rerank of approximate candidates
+        if self.needs_rerank:
+            self.vectors = (
+                embeddings_array if self.vectors is None
+                else np.vstack([self.vectors, embeddings_array])
+            )
         
         # Store metadata
         self.metadata.extend(tickets)
@@ -80,38 +227,108 @@ class VectorStore:
         Returns:
             List of (ticket, similarity_score) tuples
         """
+        _, scores, payloads = self.search_batched(query_embedding, k, threshold)
+        
+        results = []
+        for ticket, similarity in zip(payloads, scores.tolist()):
+            ticket = ticket.copy()
+            ticket['similarity_score'] = similarity
+            results.append((ticket, similarity))
+        return results
+    
+    def search_batched(
+        self,
+        query_embedding: List[float],
+        k: int = 5,
+        threshold: float = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[JiraTicket]]:
+        """
+        Search for similar tickets, returning parallel arrays instead of per-row tuples
+        
+        Args:
+            query_embedding: Query embedding vector
+            k: Number of results to return
+            threshold: Similarity threshold (optional)
+        
+        Returns:
+            (ids, scores, payloads): metadata row indices, float similarity scores and
+            the stored ticket dicts (not copies - treat as read-only), best match first
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32), [])
         if self.index is None or self.index.ntotal == 0:
             logger.warning("Vector store is empty")
-            return []
+            return empty
         
         # Convert query to numpy array
         query_array = np.array([query_embedding], dtype=np.float32)
         
+        # similarity = 1 / (1 + distance) >= threshold  <=>  distance <= 1 / threshold - 1,
+        # so the threshold is enforced on raw distances inside the search kernel
+        max_distance = 1 / threshold - 1 if threshold else None
+        
         # Search
-        distances, indices = self.index.search(query_array, min(k, self.index.ntotal))
+        distances, indices = self._search_index(query_array, min(k, self.index.ntotal), max_distance)
+        
+        # Drop FAISS padding (-1) / stale rows
+        ids = indices[0]
+        valid = (ids >= 0) & (ids < len(self.metadata))
+        ids = ids[valid]
         
         # Convert distances to similarity scores (lower distance = higher similarity)
         # Normalize: similarity = 1 / (1 + distance)
-        similarities = 1 / (1 + distances[0])
+        similarities = 1 / (1 + distances[0][valid])
         
-        results = []
-        all_candidates = []
-        for idx, similarity in zip(indices[0], similarities):
-            if idx < len(self.metadata):
-                ticket = self.metadata[idx].copy()
-                ticket['similarity_score'] = float(similarity)
-                all_candidates.append((ticket['key'], similarity))
-                
-                # Apply threshold if specified
-                if threshold is None or similarity >= threshold:
-                    results.append((ticket, float(similarity)))
-        
-        # Log all candidates with their scores
-        if all_candidates:
-            logger.info(f"Similarity scores: {[(k, f'{s:.4f}') for k, s in all_candidates]}, threshold={threshold}")
-        
-        logger.info(f"Found {len(results)} similar tickets out of {len(indices[0])} candidates (threshold={threshold})")
-        return results
+        payloads = [self.metadata[i] for i in ids.tolist()]
+        logger.opt(lazy=True).debug(
+            "Similarity scores: {}",
+            lambda: [(t['key'], f'{s:.4f}') for t, s in zip(payloads, similarities.tolist())]
+        )
+        logger.info(f"Found {ids.size} similar tickets (k={k}, threshold={threshold})")
+        return ids, similarities, payloads
+    
+    def _search_index(
+        self,
+        query_array: np.ndarray,
+        k: int,
+        max_distance: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the FAISS search and return squared L2 distances and indices
+        
+        Approximate indexes fetch k * rerank_factor candidates which are then
+        re-scored exactly against the fp32 originals, so scores stay comparable
+        with the flat index regardless of index type. Candidates farther than
+        max_distance are dropped before the top-k selection.
+        """
+        if not self.needs_rerank:
+            distances, indices = self.index.search(query_array, k)
+            if max_distance is not None:
+                keep = distances[0] <= max_distance
+                distances, indices = distances[:, keep], indices[:, keep]
+            return distances, indices
+        
+        n_candidates = min(k * settings.rerank_factor, self.index.ntotal)
+        if self.index_type == "binary":
+            _, candidates = self.index.search(np.packbits(query_array > 0, axis=1), n_candidates)
+        else:
+            _, candidates = self.index.search(query_array, n_candidates)
+        
+        candidates = candidates[0][candidates[0] >= 0]
+        # ||v - q||^2 = ||v||^2 - 2 v.q + ||q||^2: one BLAS matvec, no (n, d) difference matrix
+        vecs = np.asarray(self.vectors[candidates], dtype=np.float32)
+        query = query_array[0]
+        exact = np.einsum("ij,ij->i", vecs, vecs) - 2 * (vecs @ query) + query @ query
+        np.maximum(exact, 0, out=exact)
+        if max_distance is not None:
+            keep = exact <= max_distance
+            candidates, exact = candidates[keep], exact[keep]
+        # Partial selection of the k nearest, then sort only those
+        if exact.size > k:
+            order = np.argpartition(exact, k - 1)[:k]
+            order = order[np.argsort(exact[order])]
+        else:
+            order = np.argsort(exact)
+        return exact[order][np.newaxis, :], candidates[order][np.newaxis, :]
     
     def save(self):
         """Save FAISS index and metadata to disk"""
@@ -119,24 +336,58 @@ class VectorStore:
             logger.warning("No index to save")
             return
         
+        # Every file is written to a temp file and renamed into place, so a
+        # store that has them loaded (vectors are memory-mapped) is unaffected
+        
         # Save FAISS index
-        faiss.write_index(self.index, str(self.index_path))
+        if self.index_type == "binary":
+            _replace_atomically(self.index_path, lambda p: faiss.write_index_binary(self.index, str(p)))
+        else:
+            _replace_atomically(self.index_path, lambda p: faiss.write_index(self.index, str(p)))
+        
+        # Save fp32 originals used for reranking
+        if self.needs_rerank and self.vectors is not None:
+            _replace_atomically(self.vectors_path, lambda p: _save_npy(p, self.vectors))
         
         # Save metadata
-        with open(self.metadata_path, 'wb') as f:
-            pickle.dump(self.metadata, f)
+        _replace_atomically(self.metadata_path, lambda p: _save_pickle(p, self.metadata))
+        
+        # Save columnar metadata for fast inspection (histograms, keyword scans)
+        self._save_metadata_parquet()
         
         logger.info(f"Saved vector store with {self.index.ntotal} vectors")
     
+    def _save_metadata_parquet(self):
+        """Write the inspection columns of the metadata as a Parquet file"""
+        table = pa.Table.from_pylist(self.metadata, schema=METADATA_SCHEMA)
+        for lc_column, column in LOWERCASE_COLUMNS.items():
+            table = table.append_column(lc_column, pc.utf8_lower(pc.fill_null(table.column(column), "")))
+        _replace_atomically(self.metadata_parquet_path, lambda p: pq.write_table(
+            table,
+            str(p),
+            compression="zstd",
+            use_dictionary=DICTIONARY_COLUMNS
+        ))
+    
     def load(self):
         """Load FAISS index and metadata from disk"""
         try:
             # Load FAISS index
-            self.index = faiss.read_index(str(self.index_path))
+            if self.index_type == "binary":
+                self.index = faiss.read_index_binary(str(self.index_path))
+            else:
+                self.index = faiss.read_index(str(self.index_path))
+                self._set_search_params(self.index)
+            
+            # Memory-map fp32 originals; only reranked candidate rows are paged in
+            if self.needs_rerank:
+                self.vectors = np.load(self.vectors_path, mmap_mode='r')
             
             # Load metadata
-            with open(self.metadata_path, 'rb') as f:
-                self.metadata = pickle.load(f)
+            # Unpickle straight from a read-only mapping of the file (no read() copy)
+            with open(self.metadata_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.metadata = pickle.loads(mm)
             
             logger.info(f"Loaded vector store with {self.index.ntotal} vectors")
             
@@ -5,20 +5,17 @@ from langchain.tools import tool
 from loguru import logger
 
 from src.services import VectorStore, EmbeddingsService
+from src.services import clients
 from src.config import settings
 
 
 # Global service instances
-_vector_store = None
 _embeddings_service = None
 
 
 def get_vector_store() -> VectorStore:
-    """Get or create vector store instance"""
-    global _vector_store
-    if _vector_store is None:
-        _vector_store = VectorStore()
-    return _vector_store
+    """Get the shared vector store instance (reloaded after each sync)"""
+    return clients.get_vector_store()
 
 
 def get_embeddings_service() -> EmbeddingsService:
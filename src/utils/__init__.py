@@ -0,0 +1,5 @@
+"""Utilities module"""
+
+from .single_flight import single_flight
+
+__all__ = ["single_flight"]
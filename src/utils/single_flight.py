@@ -0,0 +1,51 @@
+"""Coalescing of identical in-flight calls (Jira reads, LLM calls, searches) across concurrent requests"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+async def single_flight(
+    inflight: Dict[Hashable, asyncio.Future],
+    key: Hashable,
+    fetch: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Run fetch() once for all concurrent callers with the same key
+    
+    The first caller performs the call; callers arriving while it is in
+    flight await the same result (or exception) instead of sending their own.
+    
+    Args:
+        inflight: Per-call-site map of keys to pending results
+        key: Identity of the call (e.g. a request tuple or a prompt hash)
+        fetch: Coroutine function performing the call
+    
+    Returns:
+        The result of fetch()
+    """
+    future = inflight.get(key)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            # The leading caller was cancelled; fetch for ourselves
+            return await fetch()
+    
+    future = asyncio.get_running_loop().create_future()
+    inflight[key] = future
+    try:
+        result = await fetch()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved so an unawaited future doesn't log a warning
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        inflight.pop(key, None)
@@ -0,0 +1,76 @@
+"""Tests for the guardrail verdict cache"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import guardrail_agent
+from src.agents.guardrail_agent import _template_key, guardrail_node
+
+
+class FakeChain:
+    """Stands in for the guardrail LLM chain, returning a fixed verdict"""
+
+    def __init__(self, verdict: str):
+        self.verdict = verdict
+        self.calls = 0
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        return SimpleNamespace(content=self.verdict)
+
+
+@pytest.fixture(autouse=True)
+def exact_text_cache(monkeypatch):
+    """Start each test with an empty template cache and the semantic lookup off"""
+    guardrail_agent._template_cache.clear()
+    monkeypatch.setattr(guardrail_agent.settings, "guardrail_cache_size", 1000)
+    monkeypatch.setattr(guardrail_agent.settings, "guardrail_cache_threshold", 1.0)
+
+
+def use_verdict(monkeypatch, verdict: str) -> FakeChain:
+    chain = FakeChain(verdict)
+    monkeypatch.setattr(guardrail_agent, "_get_chain", lambda: chain)
+    return chain
+
+
+def test_template_masks_one_ticket_key_and_one_number():
+    """Test queries differing only in their ticket key and a number share a template"""
+    assert _template_key("Update SCRUM-42 priority to 2") == _template_key("update  scrum-7 priority to 3")
+
+
+def test_template_keeps_extra_keys_and_numbers():
+    """Test bulk variants of a query do not share its template"""
+    assert _template_key("close SCRUM-1") != _template_key("close SCRUM-1 2 3")
+    assert _template_key("close SCRUM-1") != _template_key("close SCRUM-1 and SCRUM-2")
+
+
+def test_template_keeps_quoted_text():
+    """Test quoted text is part of the template"""
+    assert _template_key('create a ticket "dark mode"') != _template_key('create a ticket "something else"')
+
+
+@pytest.mark.asyncio
+async def test_valid_verdict_is_reused(monkeypatch):
+    """Test a VALID verdict is served from cache for a same-template query"""
+    chain = use_verdict(monkeypatch, "VALID")
+
+    first = await guardrail_node({"user_query": "Update SCRUM-42 priority to 2"})
+    second = await guardrail_node({"user_query": "Update SCRUM-7 priority to 3"})
+
+    assert first["is_valid_request"] and second["is_valid_request"]
+    assert chain.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_verdict_is_not_cached(monkeypatch):
+    """Test a blocked query is re-judged by the LLM every time"""
+    chain = use_verdict(monkeypatch, "INVALID: deleting tickets is not supported")
+
+    for _ in range(2):
+        state = await guardrail_node({"user_query": "Delete SCRUM-42"})
+        assert not state["is_valid_request"]
+        assert state["guardrail_message"] == "deleting tickets is not supported"
+
+    assert chain.calls == 2
+    assert len(guardrail_agent._template_cache) == 0
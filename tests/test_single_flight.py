@@ -0,0 +1,83 @@
+"""Tests for in-flight call coalescing"""
+
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import single_flight
+
+
+class Fetcher:
+    """Counts calls and returns (or raises) after a short delay"""
+
+    def __init__(self, result=None, error: Exception = None, delay: float = 0.05):
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_result():
+    """Test concurrent callers with the same key get one fetch's result"""
+    inflight = {}
+    fetch = Fetcher(result="ticket")
+
+    results = await asyncio.gather(*[single_flight(inflight, "k", fetch) for _ in range(5)])
+
+    assert results == ["ticket"] * 5
+    assert fetch.calls == 1
+    assert inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_exception():
+    """Test a failed fetch raises the same exception in every waiting caller"""
+    inflight = {}
+    error = ValueError("jira down")
+    fetch = Fetcher(error=error)
+
+    results = await asyncio.gather(
+        *[single_flight(inflight, "k", fetch) for _ in range(3)], return_exceptions=True
+    )
+
+    assert results == [error] * 3
+    assert fetch.calls == 1
+    assert inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_leader_cancelled_follower_fetches_itself():
+    """Test a waiting caller fetches on its own when the leading caller is cancelled"""
+    inflight = {}
+    fetch = Fetcher(result="ticket")
+
+    leader = asyncio.create_task(single_flight(inflight, "k", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight(inflight, "k", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await follower == "ticket"
+    assert fetch.calls == 2
+    assert inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_fetch_separately():
+    """Test callers with different keys are not coalesced"""
+    inflight = {}
+    fetch = Fetcher(result="ticket")
+
+    await asyncio.gather(single_flight(inflight, "a", fetch), single_flight(inflight, "b", fetch))
+
+    assert fetch.calls == 2